@@ -4,7 +4,8 @@
 # Learn new families from two samples + known PN.
 # NEW: compute HPT from (serial, part-number), now with support for even B coefficients.
 
-import json, argparse, os, sys
+import os, sys
+from types import SimpleNamespace
 
 MOD = 1 << 32
 u32 = lambda x: x & 0xFFFFFFFF
@@ -17,22 +18,40 @@ def inv_mod_pow2(a: int, k: int) -> int:
     """
     if k == 0:
         return 0
-    m = 1 << k
+    mask = (1 << k) - 1
     x = a
-    # Number of iterations for 2-adic Newton-Raphson method is ceil(log2(k)).
-    # 5 is enough for k<=32, 6 is enough for k<=64.
-    num_iterations = 5 if k <= 32 else 6
-    for _ in range(num_iterations):
-        x = (x * (2 - a * x)) & (m - 1)
+    # 2-adic Newton-Raphson: each step doubles the number of correct low bits.
+    # Seeding with x = a is already correct to 3 bits (a*a == 1 mod 8 for odd a),
+    # so 4 steps cover k<=32 (3->6->12->24->48) and 5 cover k<=64.
+    # Unrolled: the trip count is fixed and tiny.
+    if k <= 32:
+        x = (x * (2 - a * x)) & mask
+        x = (x * (2 - a * x)) & mask
+        x = (x * (2 - a * x)) & mask
+        x = (x * (2 - a * x)) & mask
+        return x
+    if k <= 64:
+        x = (x * (2 - a * x)) & mask
+        x = (x * (2 - a * x)) & mask
+        x = (x * (2 - a * x)) & mask
+        x = (x * (2 - a * x)) & mask
+        x = (x * (2 - a * x)) & mask
+        return x
+    bits = 3
+    while bits < k:
+        x = (x * (2 - a * x)) & mask
+        bits <<= 1
     return x
 
 def load_registry(path: str):
     if not os.path.exists(path):
         return {}
+    import json
     with open(path, "r") as f:
         return json.load(f)
 
 def save_registry(path: str, reg: dict):
+    import json
     with open(path, "w") as f:
         json.dump(reg, f, indent=2, sort_keys=True)
 
@@ -69,6 +88,21 @@ def learn_family_from_two(s1, h1, s2, h2):
         
     return A, B, K
 
+def family_inverse(fam: dict, B: int) -> int:
+    """
+    Returns inv(B) mod 2^32 for an odd B, preferring the "invB" cached in the
+    registry entry. A missing or stale cache falls back to the Newton inverse.
+    """
+    cached = fam.get("invB")
+    if cached:
+        try:
+            invB = int(cached, 16)
+            if u32(B * invB) == 1:
+                return invB
+        except ValueError:
+            pass
+    return inv_mod_pow2(B, 32)
+
 def compute_hpt_solutions(serial: int, fam: dict) -> list[int]:
     """
     Computes all possible HPT solutions for a given serial and HP family.
@@ -85,7 +119,7 @@ def compute_hpt_solutions(serial: int, fam: dict) -> list[int]:
     val = u32(K - u32(A * serial))
 
     if (B & 1) != 0:  # B is odd, standard modular inverse
-        invB = inv_mod_pow2(B, 32)
+        invB = family_inverse(fam, B)
         hpt = u32(val * invB)
         solutions.append(hpt)
     else:  # B is even, solve linear congruence
@@ -111,6 +145,27 @@ def compute_hpt_solutions(serial: int, fam: dict) -> list[int]:
             
     return solutions
 
+def find_matches(reg: dict, serial: int, hpt: int) -> list[tuple[int, dict]]:
+    """
+    Returns (pn_u32, family) for every registry family whose relation
+    A*serial + B*hpt == K (mod 2^32) holds for the given pair.
+    Equivalent to testing `hpt in compute_hpt_solutions(serial, fam)`, but
+    checks the relation directly: no inverse, no solution list per family.
+    """
+    matches = []
+    for key_p, fam in reg.items():
+        try:
+            A = int(fam["A"], 16)
+            B = int(fam["B"], 16)
+            K = int(fam["K"], 16)
+        except (KeyError, ValueError):
+            continue # Family data is incomplete
+        if B == 0:
+            continue # No unique solution; compute_hpt_solutions never matches
+        if u32(A * serial + B * hpt) == K:
+            matches.append((int(key_p, 16), fam))
+    return matches
+
 # ---------- Commands ----------
 
 def cmd_identify(args):
@@ -118,15 +173,7 @@ def cmd_identify(args):
     serial = parse_int(args.serial) & 0xFFFFFFFF
     hpt    = parse_int(args.hpt) & 0xFFFFFFFF
 
-    matches = []
-    for key_p, fam in reg.items():
-        if not all(k in fam for k in ["A", "B", "K"]):
-            continue
-
-        solutions = compute_hpt_solutions(serial, fam)
-        if hpt in solutions:
-            pn_u32 = int(key_p, 16)
-            matches.append((pn_u32, fam))
+    matches = find_matches(reg, serial, hpt)
 
     if not matches:
         print("No match in registry. You need to learn this family (see 'learn').")
@@ -151,13 +198,8 @@ def cmd_learn(args):
 
     A, B, K = learn_family_from_two(s1, h1, s2, h2)
 
-    invB_str = ""
     if (B & 1) == 0:
         print("Warning: derived B is even. The 'hpt' command will show multiple possible solutions.")
-    else:
-        invB = inv_mod_pow2(B, 32)
-        invB_str = f"  (inv=0x{invB:08X})"
-
 
     # Store
     reg = load_registry(args.registry)
@@ -173,6 +215,9 @@ def cmd_learn(args):
         "B": f"0x{B:08X}",
         "K": f"0x{K:08X}"
     }
+    # Pay for the inverse once per family, not once per 'hpt' query
+    if B & 1:
+        new_entry["invB"] = f"0x{inv_mod_pow2(B, 32):08X}"
     
     if existing_equivalents:
         new_entry["equivalents"] = existing_equivalents
@@ -183,6 +228,9 @@ def cmd_learn(args):
     print("Learned family constants:")
     print(f"  PN       : {args.part_number} (P=0x{pn_u32:08X})")
     print(f"  A        : 0x{A:08X}")
+    invB_str = ""
+    if args.verbose and "invB" in new_entry:
+        invB_str = f"  (inv={new_entry['invB']})"
     print(f"  B        : 0x{B:08X}{invB_str}")
     print(f"  K (magic): 0x{K:08X}")
     print(f"Saved to   : {args.registry}")
@@ -202,7 +250,20 @@ def cmd_hpt(args):
         print(f"No family constants for PN {args.part_number} (P=0x{pn_u32:08X}). "
               f"Learn it first with 'learn'.")
         return 1
-    
+
+    # Backfill invB for registries written before it was persisted
+    if "A" in fam and "K" in fam and "invB" not in fam:
+        try:
+            B = int(fam["B"], 16)
+        except (KeyError, ValueError):
+            B = 0
+        if B & 1:
+            fam["invB"] = f"0x{inv_mod_pow2(B, 32):08X}"
+            try:
+                save_registry(args.registry, reg)
+            except OSError:
+                pass  # read-only registry: keep the in-memory value for this query
+
     solutions = compute_hpt_solutions(serial, fam)
 
     print(f"HP P/N : {fam.get('name') or format_hp_pn(pn_u32)} (P=0x{pn_u32:08X})")
@@ -215,8 +276,8 @@ def cmd_hpt(args):
         print(f"HPT   : 0x{solutions[0]:08X} ({solutions[0]})")
     else:
         print(f"Found {len(solutions)} possible HPT solutions:")
-        for hpt_i in solutions:
-            print(f"  - 0x{hpt_i:08X} ({hpt_i})")
+        # Can be thousands of lines for highly even B; emit them in one write.
+        sys.stdout.write("".join([f"  - 0x{hpt_i:08X} ({hpt_i})\n" for hpt_i in solutions]))
     
     return 0
 
@@ -280,44 +341,124 @@ def cmd_add_equivalent(args):
 
 # ---------- Main ----------
 
-def main():
+# Subcommand table: name -> (handler, help, ((flag, help[, "switch"]), ...)).
+# Flags starting with "--" are required options unless marked "switch"
+# (an optional store_true flag); bare names are positionals.
+# Shared by the fast dispatcher and the argparse fallback below.
+_COMMANDS = {
+    "identify": (cmd_identify, "Identify HP P/N from one (serial,hpt) using registry.", (
+        ("--serial", "e.g. 0x4132E061 or 1094997473"),
+        ("--hpt",    "e.g. 0xFCD7E032 or 4240061234"),
+    )),
+    "learn": (cmd_learn, "Learn a family's constants from two samples + known HP P/N.", (
+        ("--serial1", None),
+        ("--hpt1",    None),
+        ("--serial2", None),
+        ("--hpt2",    None),
+        ("--part-number", "e.g. 712383-081"),
+        ("--verbose", "Also show the modular inverse of B.", "switch"),
+    )),
+    "hpt": (cmd_hpt, "Compute HPT from (serial, part-number) using registry.", (
+        ("--serial", "e.g. 0x4132E061 or 1094997473"),
+        ("--part-number", "e.g. 712383-081 or 712383081"),
+    )),
+    "lookup": (cmd_lookup, "Look up an HP or vendor part number.", (
+        ("part_number", "HP or vendor part number to look up."),
+    )),
+    "add-equivalent": (cmd_add_equivalent, "Add a vendor equivalent to an HP P/N.", (
+        ("--part-number",   "HP P/N, e.g. 647648-071"),
+        ("--equivalent-pn", "Vendor P/N, e.g. M393B5270DH0-CK0"),
+    )),
+}
+
+def _parse_fast(argv):
+    """
+    Minimal parser for well-formed invocations (exact '--flag value' or
+    '--flag=value' tokens). Returns a namespace, or None when anything looks
+    unusual (help, abbreviations, missing/unknown flags) so the caller can
+    defer to argparse for the proper message.
+    """
+    ns = SimpleNamespace(registry=REG_PATH_DEFAULT)
+    i, n = 0, len(argv)
+    # Global options precede the subcommand
+    while i < n and argv[i].startswith("--registry"):
+        tok = argv[i]
+        if tok == "--registry" and i + 1 < n:
+            ns.registry = argv[i + 1]
+            i += 2
+        elif tok.startswith("--registry="):
+            ns.registry = tok[len("--registry="):]
+            i += 1
+        else:
+            return None
+    if i >= n or argv[i] not in _COMMANDS:
+        return None
+    func, _, spec = _COMMANDS[argv[i]]
+    ns.cmd = argv[i]
+    ns.func = func
+    flags, switches, positionals = {}, {}, []
+    for flag, *kind in spec:
+        if not flag.startswith("--"):
+            positionals.append(flag)
+        elif kind[1:] == ["switch"]:
+            switches[flag] = flag[2:].replace("-", "_")
+            setattr(ns, switches[flag], False)
+        else:
+            flags[flag] = flag[2:].replace("-", "_")
+    i += 1
+    while i < n:
+        tok = argv[i]
+        if tok in switches:
+            setattr(ns, switches[tok], True)
+        elif tok.startswith("-"):
+            name, eq, val = tok.partition("=")
+            dest = flags.get(name)
+            if dest is None:
+                return None
+            if not eq:
+                if i + 1 >= n:
+                    return None
+                i += 1
+                val = argv[i]
+            setattr(ns, dest, val)
+        elif positionals:
+            setattr(ns, positionals.pop(0), tok)
+        else:
+            return None
+        i += 1
+    if positionals or any(not hasattr(ns, d) for d in flags.values()):
+        return None
+    return ns
+
+def _build_parser():
+    import argparse
     ap = argparse.ArgumentParser(
         description="Identify/learn HP SmartMemory families, or compute HPT from (serial, PN)."
     )
     ap.add_argument("--registry", default=REG_PATH_DEFAULT,
                     help=f"JSON registry path (default: {REG_PATH_DEFAULT})")
     sub = ap.add_subparsers(dest="cmd", required=True)
-
-    p_id = sub.add_parser("identify", help="Identify HP P/N from one (serial,hpt) using registry.")
-    p_id.add_argument("--serial", required=True, help="e.g. 0x4132E061 or 1094997473")
-    p_id.add_argument("--hpt",    required=True, help="e.g. 0xFCD7E032 or 4240061234")
-    p_id.set_defaults(func=cmd_identify)
-
-    p_learn = sub.add_parser("learn", help="Learn a family's constants from two samples + known HP P/N.")
-    p_learn.add_argument("--serial1", required=True)
-    p_learn.add_argument("--hpt1",    required=True)
-    p_learn.add_argument("--serial2", required=True)
-    p_learn.add_argument("--hpt2",    required=True)
-    p_learn.add_argument("--part-number", required=True, help="e.g. 712383-081")
-    p_learn.set_defaults(func=cmd_learn)
-
-    p_hpt = sub.add_parser("hpt", help="Compute HPT from (serial, part-number) using registry.")
-    p_hpt.add_argument("--serial", required=True, help="e.g. 0x4132E061 or 1094997473")
-    p_hpt.add_argument("--part-number", required=True, help="e.g. 712383-081 or 712383081")
-    p_hpt.set_defaults(func=cmd_hpt)
-
-    p_lookup = sub.add_parser("lookup", help="Look up an HP or vendor part number.")
-    p_lookup.add_argument("part_number", help="HP or vendor part number to look up.")
-    p_lookup.set_defaults(func=cmd_lookup)
-
-    p_add_equiv = sub.add_parser("add-equivalent", help="Add a vendor equivalent to an HP P/N.")
-    p_add_equiv.add_argument("--part-number", required=True, help="HP P/N, e.g. 647648-071")
-    p_add_equiv.add_argument("--equivalent-pn", required=True, help="Vendor P/N, e.g. M393B5270DH0-CK0")
-    p_add_equiv.set_defaults(func=cmd_add_equivalent)
-
-
-    args = ap.parse_args()
+    for name, (func, help_text, spec) in _COMMANDS.items():
+        p = sub.add_parser(name, help=help_text)
+        for flag, flag_help, *kind in spec:
+            if kind == ["switch"]:
+                p.add_argument(flag, action="store_true", help=flag_help)
+            elif flag.startswith("--"):
+                p.add_argument(flag, required=True, help=flag_help)
+            else:
+                p.add_argument(flag, help=flag_help)
+        p.set_defaults(func=func)
+    return ap
+
+def main(argv=None):
+    # argparse (and its subparser graph) is only built when the fast path
+    # cannot handle the command line, e.g. for --help or usage errors.
+    if argv is None:
+        argv = sys.argv[1:]
+    args = _parse_fast(argv)
+    if args is None:
+        args = _build_parser().parse_args(argv)
     raise SystemExit(args.func(args))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
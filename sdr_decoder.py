@@ -5,8 +5,11 @@
 #
 # SDR (PC66/PC100/PC133) SPD decoder per JEDEC SDR SDRAM SPD (bytes per table).
 
-from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+import bisect
 import math
+import struct
 
 JEP106_BANK_NAME = {
     # You can extend this with your map; for now we render raw codes if unknown
@@ -20,53 +23,69 @@ JEP106_BANK_NAME = {
     (3, 0x1B): "Crucial Technology",
 }
 
+def _build_jep106_table(names: Dict[Tuple[int, int], str]) -> Tuple[Tuple[Optional[str], ...], ...]:
+    # [bank][code] -> name; banks without entries share one all-None row.
+    empty = (None,) * 256
+    rows = [empty] * 128
+    for (bank, code), name in names.items():
+        row = list(rows[bank])
+        row[code] = name
+        rows[bank] = tuple(row)
+    return tuple(rows)
+
+_JEP106_TABLE = _build_jep106_table(JEP106_BANK_NAME)
+
+# Packed BCD byte -> value (e.g. 0x19 -> 19); used for the YY/WW date bytes
+_BCD = tuple((b & 0x0F) + 10 * ((b >> 4) & 0x0F) for b in range(256))
+
 def _sum8(data: bytes) -> int:
     return sum(data) & 0xFF
 
-def _u16le(lo: int, hi: int) -> int:
-    return (lo | (hi << 8)) & 0xFFFF
+_U16 = struct.Struct('<H').unpack_from
+
+# Timing byte encodings, precomputed for all 256 byte values so decoding a
+# field is a single index rather than per-call shift/mask/float arithmetic.
+# tenths: high nibble = integer ns (0..15), low nibble = tenths (0..9)
+_NS_TENTHS = tuple(((b >> 4) & 0xF) + (b & 0xF) / 10.0 for b in range(256))
+# quarter: upper 6 bits = integer ns (1..63), lower 2 bits encodes .00, .25, .50, .75
+_NS_QUARTER = tuple(((b >> 2) & 0x3F) + (b & 0x3) * 0.25 for b in range(256))
+# signed tenths: bit 7 = sign, bits 6..4 = integer ns, low nibble = tenths
+_SIGNED_NS_TENTHS = tuple((-1.0 if (b & 0x80) else 1.0) * (((b >> 4) & 0x7) + (b & 0xF) / 10.0)
+                          for b in range(256))
 
 def _ns_tenths(b: int) -> float:
-    # high nibble = integer ns (0..15), low nibble = tenths (0..9)
-    return ((b >> 4) & 0xF) + (b & 0xF) / 10.0
+    return _NS_TENTHS[b]
 
 def _ns_quarter(b: int) -> float:
-    # upper 6 bits = integer ns (1..63), lower 2 bits encodes .00, .25, .50, .75
-    whole = (b >> 2) & 0x3F
-    frac  = (b & 0x3) * 0.25
-    return whole + frac
+    return _NS_QUARTER[b]
 
 def _signed_ns_tenths(b: int) -> float:
-    sign = -1.0 if (b & 0x80) else 1.0
-    ns   = ((b >> 4) & 0x7) + (b & 0xF) / 10.0
-    return sign * ns
+    return _SIGNED_NS_TENTHS[b]
+
+# Byte 8 “interface voltage” — common encodings seen in modules
+_IFACE_VOLTAGES = {
+    0x00: "TTL (5V tolerant)",
+    0x01: "LVTTL (3.3V tolerant)",
+    0x02: "HSTL",
+    0x03: "SSTL 3.3V",
+    0x04: "SSTL 2.5V",
+}
+# Byte 11 bits 1:0
+_ECC_MODES = {0: "non-ECC", 1: "parity", 2: "ECC"}
+# Byte 12 bits 2:0
+_REFRESH_RATES = {0: "64 kHz", 1: "256 kHz", 2: "128 kHz", 3: "32 kHz", 4: "16 kHz", 5: "8 kHz"}
 
 def _interface_voltage_label(code: int) -> str:
-    # Byte 8 “interface voltage” — common encodings seen in modules
-    return {
-        0x00: "TTL (5V tolerant)",
-        0x01: "LVTTL (3.3V tolerant)",
-        0x02: "HSTL",
-        0x03: "SSTL 3.3V",
-        0x04: "SSTL 2.5V",
-    }.get(code & 0x07, f"Unknown (0x{code & 0x07:02X})")
-
-def _mhz_from_tck_ns(tck_ns: float) -> float:
-    return 0.0 if tck_ns <= 0.0 else 1000.0 / tck_ns  # MHz
-
-def _cycles(ns_val: float, tck_ns: float) -> int:
-    if tck_ns <= 0.0:
-        return 0
-    # Use round() instead of math.ceil() for more realistic timings.
-    return int(round(ns_val / tck_ns))
+    return _IFACE_VOLTAGES.get(code & 0x07) or f"Unknown (0x{code & 0x07:02X})"
+
+# Rounded-MHz band edges -> label: 60..72 PC66, 90..110 PC100, 124..140 PC133
+_PC_EDGES  = (60, 73, 90, 111, 124, 141)
+_PC_LABELS = (None, "PC66", None, "PC100", None, "PC133", None)
 
 def _pc_rating_from_mhz(mhz: float) -> str:
-    rounded = int(round(mhz))
-    if 60 <= rounded <= 72:  return "PC66"
-    if 90 <= rounded <= 110: return "PC100"
-    if 124 <= rounded <= 140:return "PC133"
+    label = _PC_LABELS[bisect.bisect_right(_PC_EDGES, int(round(mhz)))]
     # Fallback: bandwidth-ish
-    return f"PC{int(round(mhz*8.0))}"
+    return label or f"PC{int(round(mhz*8.0))}"
 
 def _bool(b: int, bit: int) -> bool:
     return (b >> bit) & 1 == 1
@@ -80,51 +99,139 @@ def _decode_density_bitmap(b31: int) -> List[str]:
             out.append(f"{sizes[i]} MiB")
     return out
 
+# Per-byte lookup tables for the bitmap fields (one entry per possible byte value).
+# Bytes 18/19/20: bits 0..6 are documented; bit7 reserved.
+_LAT_BITS       = tuple(tuple(v for v in range(7) if (b >> v) & 1) for b in range(256))
+_LAT_BITS_PLUS1 = tuple(tuple(v + 1 for v in range(7) if (b >> v) & 1) for b in range(256))
+# Byte 16: bits 0..3 correspond to burst lengths 1,2,4,8
+_BL_BITS        = tuple(tuple(bl for bit, bl in enumerate((1, 2, 4, 8)) if (b >> bit) & 1) for b in range(256))
+
 def _decode_burst_lengths(b16: int) -> List[int]:
-    out = []
-    for bit, bl in enumerate([1, 2, 4, 8]):  # bits 0..3 correspond to 1,2,4,8
-        if _bool(b16, bit):
-            out.append(bl)
-    return out
+    return list(_BL_BITS[b16])
 
 def _decode_bitmap_latencies(b: int, start_label: str, add_one: bool = False) -> List[int]:
     # Simple “bit -> integer” list (CAS/CS/WE “complement” latency bitmaps)
-    # Bytes 18/19/20: bits 0..6 are documented; bit7 reserved.
-    vals = []
-    for v in range(0, 7 + 1):
-        if v == 7:
-            continue  # ignore bit7 per table
-        if _bool(b, v):
-            vals.append(v + 1 if add_one else v) # Use the new parameter
-    return vals
+    return list(_LAT_BITS_PLUS1[b] if add_one else _LAT_BITS[b])
+
+_UNKNOWN_JEDEC = "JEDEC(b{:02X},c{:02X})".format
 
 def _decode_manufacturer_id(bank_bytes_le: bytes) -> str:
     # Bytes 64..71 store JEDEC ID in little-endian pairs, trailing zero-padded.
     # Common layout (little-endian pairs): [LSB(bank0), MSB(code0), LSB(bank1), MSB(code1), ...]
+    n = len(bank_bytes_le)
+    if n == 0 or (bank_bytes_le[0] == 0 and (n == 1 or bank_bytes_le[1] == 0)):
+        return ""  # blank manufacturer block
+    table = _JEP106_TABLE
     pairs = []
-    for i in range(0, len(bank_bytes_le), 2):
+    for i in range(0, n, 2):
         lsb = bank_bytes_le[i]
-        msb = bank_bytes_le[i+1] if i+1 < len(bank_bytes_le) else 0
+        msb = bank_bytes_le[i+1] if i+1 < n else 0
         if lsb == 0 and msb == 0:
             break
         bank = lsb & 0x7F
         code = msb
-        name = JEP106_BANK_NAME.get((bank, code))
-        pairs.append(f"{name}" if name else f"JEDEC(b{bank:02X},c{code:02X})")
+        pairs.append(table[bank][code] or _UNKNOWN_JEDEC(bank, code))
     return ", ".join(pairs) if pairs else ""
 
+# (start, end, name padded to the map's column width) for dump_field_map
+_FIELD_MAP_SEGS = tuple((start, end, name.ljust(26)) for start, end, name in (
+    (0, 0,  "Bytes Present"),
+    (1, 1,  "EEPROM log2 size"),
+    (2, 2,  "Memory Type"),
+    (3, 3,  "Row bits (B2|B1)"),
+    (4, 4,  "Col bits (B2|B1)"),
+    (5, 5,  "Banks on Module"),
+    (6, 7,  "Module Data Width"),
+    (8, 8,  "Interface Voltage"),
+    (9, 10, "tCK/tAC @ highest CL"),
+    (11,11, "DIMM config"),
+    (12,12, "Refresh rate"),
+    (13,14, "Primary/ECC SDRAM width"),
+    (15,15, "Random read clock delay"),
+    (16,16, "Burst lengths"),
+    (17,17, "Banks per SDRAM"),
+    (18,20, "CAS/CS/WE bitmaps"),
+    (21,21, "Module features"),
+    (22,22, "Chip features"),
+    (23,26, "tCK/tAC @ medium/short CL"),
+    (27,30, "tRP/tRRD/tRCD/tRAS"),
+    (31,31, "Module density bitmap"),
+    (32,35, "AC/ADDR/DIN setup/hold"),
+    (62,62, "SPD revision"),
+    (63,63, "Checksum"),
+    (64,71, "JEDEC IDs"),
+    (72,72, "Mfg location"),
+    (73,90, "Part number"),
+    (91,92, "Module revision"),
+    (93,94, "Mfg date YY/WW"),
+    (95,98, "Serial number"),
+    (99,125,"Vendor-specific"),
+    (126,127,"Intel extensions"),
+))
+
+# ----- Decoded sections -----
+# decode() fills these slotted records and hands out plain dicts (same keys, same
+# order) for JSON/HTML; pretty_print reads the records directly via attributes.
+# Field defaults mirror the placeholders pretty_print shows for missing keys.
+
+class _Section:
+    __slots__ = ()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]):
+        return cls(**{k: v for k, v in d.items() if k in cls.__slots__})
+
+@dataclass(slots=True)
+class _General(_Section):
+    bytes_present: Any = None
+    eeprom_log2_size: Any = None
+    memory_type: Any = None
+    interface_voltage: str = ""
+    spd_revision: str = ""
+
+@dataclass(slots=True)
+class _Addressing(_Section):
+    module_data_width_bits: Any = "?"
+    banks_on_module: Any = "?"
+    bank1_row_bits: Any = "?"
+    bank1_col_bits: Any = "?"
+    bank2_row_bits: Any = "?"
+    bank2_col_bits: Any = "?"
+    banks_per_device: Any = "?"
+
+@dataclass(slots=True)
+class _Timings(_Section):
+    tCK_highestCL_ns: float = 0
+    tAC_highestCL_ns: float = 0
+    tCK_mediumCL_ns: float = 0
+    tAC_mediumCL_ns: float = 0
+    tCK_shortCL_ns: float = 0
+    tAC_shortCL_ns: float = 0
+    tRP_min_ns: float = 0
+    tRRD_min_ns: float = 0
+    tRCD_min_ns: float = 0
+    tRAS_min_ns: float = 0
+
 class SDRDecoder:
     """Decoder for 128-byte SDR SPD per JEDEC table."""
 
     def __init__(self, data: bytes):
-        self.data = data
-        if len(self.data) < 128:
-            raise ValueError("SDR SPD must be 128 bytes (got %d)." % len(self.data))
+        if len(data) < 128:
+            raise ValueError("SDR SPD must be 128 bytes (got %d)." % len(data))
+        # Normalize once (no-op for bytes input) so bytearray/mmap callers can't
+        # mutate the image under us, then slice through a zero-copy view.
+        self.data = bytes(data)
+        self._mv = memoryview(self.data)
+        # (decoded dict, _General, _Addressing, _Timings) from the last decode()
+        self._sections = None
 
     # ----- Public API -----
 
     def decode(self) -> Dict:
-        d = self.data
+        d = self._mv
         warnings = []
 
         # ---- General (JEDEC table for SDR) ----
@@ -133,51 +240,49 @@ class SDRDecoder:
         col_addr_b1 = d[4] & 0x0F
         col_addr_b2 = (d[4] >> 4) & 0x0F   # 0 → same as bank1
         banks_on_module = d[5]
-        width_bits = _u16le(d[6], d[7])
-
-        general = {
-            "bytes_present": d[0],
-            "eeprom_log2_size": d[1],
-            "memory_type": 0x04,  # SDR
-            "interface_voltage": _interface_voltage_label(d[8]),
-            "spd_revision": f"{(d[62] >> 4) & 0xF}.{d[62] & 0xF}",
-        }
+        width_bits = _U16(d, 6)[0]
+
+        general = _General(
+            bytes_present=d[0],
+            eeprom_log2_size=d[1],
+            memory_type=0x04,  # SDR
+            interface_voltage=_interface_voltage_label(d[8]),
+            spd_revision=f"{(d[62] >> 4) & 0xF}.{d[62] & 0xF}",
+        )
 
         # ---- Addressing / module config (DDR3-like section names) ----
-        addressing = {
-            "module_data_width_bits": width_bits,
-            "banks_on_module": banks_on_module,
-            "bank1_row_bits": row_addr_b1 or None,
-            "bank1_col_bits": col_addr_b1 or None,
-            "bank2_row_bits": (row_addr_b2 if row_addr_b2 != 0 else row_addr_b1) or None,
-            "bank2_col_bits": (col_addr_b2 if col_addr_b2 != 0 else col_addr_b1) or None,
-            "banks_per_device": d[17],
-        }
+        addressing = _Addressing(
+            module_data_width_bits=width_bits,
+            banks_on_module=banks_on_module,
+            bank1_row_bits=row_addr_b1 or None,
+            bank1_col_bits=col_addr_b1 or None,
+            bank2_row_bits=(row_addr_b2 if row_addr_b2 != 0 else row_addr_b1) or None,
+            bank2_col_bits=(col_addr_b2 if col_addr_b2 != 0 else col_addr_b1) or None,
+            banks_per_device=d[17],
+        )
 
         # Timings (ns)
-        timings = {
-            # CHANGE THESE KEYS
-            "tCK_highestCL_ns": _ns_tenths(d[9]),
-            "tAC_highestCL_ns": _ns_tenths(d[10]),
-            "tCK_mediumCL_ns":  _ns_tenths(d[23]),
-            "tAC_mediumCL_ns":  _ns_tenths(d[24]),
-            "tCK_shortCL_ns": _ns_quarter(d[25]),
-            "tAC_shortCL_ns": _ns_quarter(d[26]),
-            # ADD "_min_" SUFFIX TO THESE KEYS
-            "tRP_min_ns": float(d[27]),
-            "tRRD_min_ns": float(d[28]),
-            "tRCD_min_ns": float(d[29]),
-            "tRAS_min_ns": float(d[30]),
-        }
-
-        if timings["tCK_mediumCL_ns"] == 0 or timings["tCK_shortCL_ns"] == 0:
+        timings = _Timings(
+            tCK_highestCL_ns=_ns_tenths(d[9]),
+            tAC_highestCL_ns=_ns_tenths(d[10]),
+            tCK_mediumCL_ns=_ns_tenths(d[23]),
+            tAC_mediumCL_ns=_ns_tenths(d[24]),
+            tCK_shortCL_ns=_ns_quarter(d[25]),
+            tAC_shortCL_ns=_ns_quarter(d[26]),
+            tRP_min_ns=float(d[27]),
+            tRRD_min_ns=float(d[28]),
+            tRCD_min_ns=float(d[29]),
+            tRAS_min_ns=float(d[30]),
+        )
+
+        if timings.tCK_mediumCL_ns == 0 or timings.tCK_shortCL_ns == 0:
             warnings.append("SPD contains an incomplete timing profile; slower speeds were extrapolated.")
 
         # Capabilities (unified shape like DDR3 pretty printer)
-        ecc_mode = {0: "non-ECC", 1: "parity", 2: "ECC"}.get(d[11] & 0x03, f"0x{d[11] & 0x03:02X}")
+        ecc_mode = _ECC_MODES.get(d[11] & 0x03) or f"0x{d[11] & 0x03:02X}"
         capabilities = {
             "dimm_config": {"ecc_mode": ecc_mode},
-            "refresh_rate": {0: "64 kHz", 1: "256 kHz", 2: "128 kHz", 3: "32 kHz", 4: "16 kHz", 5: "8 kHz"}.get(d[12] & 0x07, f"0x{d[12] & 0x07:02X}"),
+            "refresh_rate": _REFRESH_RATES.get(d[12] & 0x07) or f"0x{d[12] & 0x07:02X}",
             "burst_lengths_supported": _decode_burst_lengths(d[16]),
             "cas_latencies": _decode_bitmap_latencies(d[18], "CAS", add_one=True), # CAS needs +1
             "cs_latencies":  _decode_bitmap_latencies(d[19], "CS"),                # CS does not
@@ -214,48 +319,53 @@ class SDRDecoder:
         #   - "medium  CL" uses bytes 23/24 (tCK,tAC)     -> label "med"
         #   - "short   CL" uses bytes 25/26 (tCK,tAC/quarter) -> label "short"
         # Some modules leave "short" zeroed; we skip any tCK==0 entries.
-# ---- Derived speeds & cycle timings --------------------------------
         profiles = []
-        
-        # This is the user's latest "better fix" from the previous prompt
+        seen_tck = set()  # rounded tCK of every profile already in `profiles`
+
         def add_profile(label: str, tck_ns: float, tac_ns: float):
             if tck_ns <= 0.0:
                 return
-            
+            # Prevent adding duplicate profiles based on tCK
+            tck_key = round(tck_ns, 3)
+            if tck_key in seen_tck:
+                return
+
+            # tck_ns > 0 from here on, so cycle counts are computed inline.
+            # Use round() instead of math.ceil() for more realistic timings, and
+            # true division (not * 1/tck) so half-way cases round consistently.
             supported_cls = capabilities["cas_latencies"]
-            
-            mhz = _mhz_from_tck_ns(tck_ns)
+
+            mhz = 1000.0 / tck_ns
             pc = _pc_rating_from_mhz(mhz)
-            
+
             # Calculate initial CL and clamp it to the supported range
-            calculated_cl = _cycles(tac_ns, tck_ns)
+            calculated_cl = int(round(tac_ns / tck_ns))
             final_cl = max(calculated_cl, min(supported_cls)) if supported_cls else calculated_cl
-            
+
             prof = {
                 "label": label,
-                "tCK_ns": round(tck_ns, 3),
+                "tCK_ns": tck_key,
                 "tAC_ns": round(tac_ns, 3),
                 "freq_MHz": round(mhz, 1),
                 "data_rate_MB/s": int(round(mhz*8)),
                 "pc_rating": pc,
                 "CL": final_cl,
-                "tRCD": _cycles(timings["tRCD_min_ns"], tck_ns),
-                "tRP": _cycles(timings["tRP_min_ns"],  tck_ns),
-                "tRAS": _cycles(timings["tRAS_min_ns"], tck_ns),
-                "tRRD": _cycles(timings["tRRD_min_ns"], tck_ns),
+                "tRCD": int(round(timings.tRCD_min_ns / tck_ns)),
+                "tRP": int(round(timings.tRP_min_ns / tck_ns)),
+                "tRAS": int(round(timings.tRAS_min_ns / tck_ns)),
+                "tRRD": int(round(timings.tRRD_min_ns / tck_ns)),
             }
-            # Prevent adding duplicate profiles based on tCK
-            if not any(p['tCK_ns'] == prof['tCK_ns'] for p in profiles):
-                profiles.append(prof)
+            seen_tck.add(tck_key)
+            profiles.append(prof)
 
         # 1. Add profiles that are explicitly defined in the SPD
-        add_profile("highest", timings["tCK_highestCL_ns"], timings["tAC_highestCL_ns"])
-        add_profile("medium",  timings["tCK_mediumCL_ns"],  timings["tAC_mediumCL_ns"])
-        add_profile("short",   timings["tCK_shortCL_ns"],   timings["tAC_shortCL_ns"])
+        add_profile("highest", timings.tCK_highestCL_ns, timings.tAC_highestCL_ns)
+        add_profile("medium",  timings.tCK_mediumCL_ns,  timings.tAC_mediumCL_ns)
+        add_profile("short",   timings.tCK_shortCL_ns,   timings.tAC_shortCL_ns)
 
         # 2. Extrapolate any missing standard profiles
         # We use the fastest available tAC as the base access time for calculations.
-        base_tac_ns = timings.get("tAC_highestCL_ns")
+        base_tac_ns = timings.tAC_highestCL_ns
         if base_tac_ns and base_tac_ns > 0:
             standard_profiles = [
                 ("PC133", 7.5),
@@ -269,14 +379,6 @@ class SDRDecoder:
         # Sort profiles from fastest to slowest
         profiles.sort(key=lambda p: p["freq_MHz"], reverse=True)
 
-        derived = {
-            "profiles": profiles,
-        }
-
-        add_profile("highest", timings["tCK_highestCL_ns"], timings["tAC_highestCL_ns"])
-        add_profile("medium",  timings["tCK_mediumCL_ns"],  timings["tAC_mediumCL_ns"])
-        add_profile("short",   timings["tCK_shortCL_ns"],   timings["tAC_shortCL_ns"])
-
         derived = {
             "profiles": profiles,  # ordered list for printing
         }
@@ -286,8 +388,8 @@ class SDRDecoder:
         part_num = bytes(d[73:91]).decode("ascii", errors="replace").rstrip('\x00').strip()
         serial_num_hex = d[95:99].hex().upper()
         rev_lo, rev_hi = d[91], d[92]
-        year = (d[93] & 0x0F) + 10 * ((d[93] >> 4) & 0x0F)  # YY in BCD
-        week = (d[94] & 0x0F) + 10 * ((d[94] >> 4) & 0x0F)  # WW in BCD
+        year = _BCD[d[93]]  # YY in BCD
+        week = _BCD[d[94]]  # WW in BCD
         manufacturing = {
             "jedec_ids_readable": jedec_ids or "",
             "location_code": d[72],
@@ -306,7 +408,7 @@ class SDRDecoder:
 
         # Checksum (byte 63) is simple sum of 0..62 (not negated)
         stored = d[63]
-        computed = _sum8(d[0:63])
+        computed = _sum8(self.data[0:63])
         crc_info = {
             "type": "checksum8(sum0..62)",
             "stored": stored,
@@ -323,10 +425,10 @@ class SDRDecoder:
             warnings.append("Serial number is all zeros.")
 
         # Return DDR3-like top-level keys so the shared UI/HTML just works
-        return {
-            "general": general,
-            "addressing": addressing,
-            "timings_ns": timings,
+        result = {
+            "general": general.as_dict(),
+            "addressing": addressing.as_dict(),
+            "timings_ns": timings.as_dict(),
             "derived": derived,
             "capabilities": capabilities,
             "manufacturing": manufacturing,
@@ -334,69 +436,78 @@ class SDRDecoder:
             "crc_info": crc_info,
             "warnings": warnings,
         }
+        self._sections = (result, general, addressing, timings)
+        return result
 
 
     def pretty_print(self, data: Dict, programmer_mode: bool = False):
-        def p(offset_info, name, value, hex_info=None):
-            if programmer_mode:
-                if isinstance(offset_info, int):
-                    off = f"[{offset_info:03d}]"
-                elif isinstance(offset_info, tuple) and len(offset_info) == 2:
-                    off = f"[{offset_info[0]:03d}-{offset_info[1]:03d}]"
-                elif isinstance(offset_info, str):
-                    byte_off, bits = offset_info.split(",", 1)
-                    off = f"[{int(byte_off):03d}, {bits.strip()}]"
-                else:
-                    off = ""
-                hx = ""
-                if hex_info is not None:
-                    if isinstance(hex_info, int):
-                        hx = f"(0x{hex_info:02X})"
-                    elif isinstance(hex_info, (bytes, bytearray)):
-                        hx = f"({' '.join(f'{b:02X}' for b in hex_info)})"
-                    elif isinstance(hex_info, (list, tuple)):
-                        hx = f"({' '.join(f'{int(b)&0xFF:02X}' for b in hex_info)})"
-                print(f"  {off:<18} {name:<28} {value} {hx}")
+        def p_full(offset_info, name, value, hex_info=None):
+            if isinstance(offset_info, int):
+                off = f"[{offset_info:03d}]"
+            elif isinstance(offset_info, tuple) and len(offset_info) == 2:
+                off = f"[{offset_info[0]:03d}-{offset_info[1]:03d}]"
+            elif isinstance(offset_info, str):
+                byte_off, bits = offset_info.split(",", 1)
+                off = f"[{int(byte_off):03d}, {bits.strip()}]"
             else:
-                print(f"  {name:<28} {value}")
-
-        g = data.get("general", {})
-        a = data.get("addressing", {})
-        t = data.get("timings_ns", {})
+                off = ""
+            hx = ""
+            if hex_info is not None:
+                if isinstance(hex_info, int):
+                    hx = f"(0x{hex_info:02X})"
+                elif isinstance(hex_info, (bytes, bytearray, memoryview)):
+                    hx = f"({hex_info.hex(' ').upper()})"
+                elif isinstance(hex_info, (list, tuple)):
+                    hx = f"({bytes(int(b) & 0xFF for b in hex_info).hex(' ').upper()})"
+            print(f"  {off:<18} {name:<28} {value} {hx}")
+
+        def p_fast(offset_info, name, value, hex_info=None):
+            print(f"  {name:<28} {value}")
+
+        # Pick the row printer once instead of testing programmer_mode per row
+        p = p_full if programmer_mode else p_fast
+        # Zero-copy view: raw[i] is an int, raw[i:j] slices without allocating bytes
+        raw = self._mv
+
+        if self._sections is not None and data is self._sections[0]:
+            g, a, t = self._sections[1:]
+        else:
+            g = _General.from_dict(data.get("general", {}))
+            a = _Addressing.from_dict(data.get("addressing", {}))
+            t = _Timings.from_dict(data.get("timings_ns", {}))
         c = data.get("capabilities", {})
         m = data.get("manufacturing", {})
         crc = data.get("crc_info", {})
 
         # --- SPD General ---
         print("--- SPD General ---")
-        p(0,  "Bytes Present",         g.get("bytes_present"),                  self.data[0])
-        p(1,  "EEPROM Size (log2)",    g.get("eeprom_log2_size"),               self.data[1])
-        p(2,  "Memory Type",           "SDR SDRAM (0x04)",                      self.data[2])
-        p(8,  "Interface Voltage",     g.get("interface_voltage",""),           self.data[8])
-        p(62, "SPD Revision",          g.get("spd_revision",""),                self.data[62])
-        p(3,  "Row/Col (Bank1)",       f"r{a.get('bank1_row_bits','?')} c{a.get('bank1_col_bits','?')}", self.data[3])
-        p(4,  "Row/Col (Bank2)",       f"r{a.get('bank2_row_bits','?')} c{a.get('bank2_col_bits','?')}", self.data[4])
+        p(0,  "Bytes Present",         g.bytes_present,                         raw[0])
+        p(1,  "EEPROM Size (log2)",    g.eeprom_log2_size,                      raw[1])
+        p(2,  "Memory Type",           "SDR SDRAM (0x04)",                      raw[2])
+        p(8,  "Interface Voltage",     g.interface_voltage,                     raw[8])
+        p(62, "SPD Revision",          g.spd_revision,                          raw[62])
+        p(3,  "Row/Col (Bank1)",       f"r{a.bank1_row_bits} c{a.bank1_col_bits}", raw[3])
+        p(4,  "Row/Col (Bank2)",       f"r{a.bank2_row_bits} c{a.bank2_col_bits}", raw[4])
 
         # --- Module Configuration ---
         print("\n--- Module Configuration ---")
-        p((6,7), "Module Data Width",  f"{a.get('module_data_width_bits','?')} bits", self.data[6:8])
-        p(5,     "Banks on Module",    a.get("banks_on_module","?"),            self.data[5])
-        p(17,    "Banks per SDRAM",    a.get("banks_per_device","?"),           self.data[17])
+        p((6,7), "Module Data Width",  f"{a.module_data_width_bits} bits",      raw[6:8])
+        p(5,     "Banks on Module",    a.banks_on_module,                       raw[5])
+        p(17,    "Banks per SDRAM",    a.banks_per_device,                      raw[17])
 
         # --- Timing (ns) ---
         print("\n--- Timing (ns) ---")
-        p(9,  "tCK @ highest CL", f"{t.get('tCK_highestCL_ns',0):.1f} ns", self.data[9])
-        p(10, "tAC @ highest CL", f"{t.get('tAC_highestCL_ns',0):.1f} ns", self.data[10])
-        p(23, "tCK @ medium  CL", f"{t.get('tCK_mediumCL_ns',0):.1f} ns", self.data[23])
-        p(24, "tAC @ medium  CL", f"{t.get('tAC_mediumCL_ns',0):.1f} ns", self.data[24])
-        p(25, "tCK @ short   CL", f"{t.get('tCK_shortCL_ns',0):.2f} ns", self.data[25])
-        p(26, "tAC @ short   CL", f"{t.get('tAC_shortCL_ns',0):.2f} ns", self.data[26])
+        p(9,  "tCK @ highest CL", f"{t.tCK_highestCL_ns:.1f} ns", raw[9])
+        p(10, "tAC @ highest CL", f"{t.tAC_highestCL_ns:.1f} ns", raw[10])
+        p(23, "tCK @ medium  CL", f"{t.tCK_mediumCL_ns:.1f} ns", raw[23])
+        p(24, "tAC @ medium  CL", f"{t.tAC_mediumCL_ns:.1f} ns", raw[24])
+        p(25, "tCK @ short   CL", f"{t.tCK_shortCL_ns:.2f} ns", raw[25])
+        p(26, "tAC @ short   CL", f"{t.tAC_shortCL_ns:.2f} ns", raw[26])
         p(27, "tRP / tRRD / tRCD / tRAS",
-            # And also use the CORRECT keys here (with the "_min_" suffix)
-            f"{t.get('tRP_min_ns',0):.1f} / {t.get('tRRD_min_ns',0):.1f} / {t.get('tRCD_min_ns',0):.1f} / {t.get('tRAS_min_ns',0):.1f} ns",
-            self.data[27:31])
+            f"{t.tRP_min_ns:.1f} / {t.tRRD_min_ns:.1f} / {t.tRCD_min_ns:.1f} / {t.tRAS_min_ns:.1f} ns",
+            raw[27:31])
         
-        module_width = a.get('module_data_width_bits','?')
+        module_width = a.module_data_width_bits
 
         # --- Derived Speeds & Timings (clocks) ---
         derv = data.get("derived", {})
@@ -419,7 +530,7 @@ class SDRDecoder:
                 hex_pair = ""
                 if programmer_mode and raw_off:
                     lo, hi = raw_off
-                    hex_pair = f" ({self.data[lo]:02X} {self.data[hi]:02X})"
+                    hex_pair = f" ({raw[lo]:02X} {raw[hi]:02X})"
                 print(f"  @{mhz:>6.1f} MHz (tCK {tck:.3f} ns){hex_pair}  →  "
                       f"CL-{cl} tRCD-{trcd} tRP-{trp} tRAS-{tras} tRRD-{trrd}  · {pc} (~{mbps} MB/s)")
 
@@ -427,32 +538,32 @@ class SDRDecoder:
         # --- Capabilities ---
         print("\n--- Capabilities ---")
         ecc_mode = (c.get("dimm_config") or {}).get("ecc_mode","")
-        p(11, "DIMM Configuration",    f"{ecc_mode}   · Refresh {c.get('refresh_rate','')}", self.data[11])
+        p(11, "DIMM Configuration",    f"{ecc_mode}   · Refresh {c.get('refresh_rate','')}", raw[11])
         bl = c.get("burst_lengths_supported", [])
-        p(16, "Burst Lengths",         "[" + ", ".join(str(x) for x in bl) + "]", self.data[16])
-        p(18, "CAS Latencies",         "[" + ", ".join(str(x) for x in c.get('cas_latencies', [])) + "]", self.data[18])
-        p(19, "CS  Latencies",         "[" + ", ".join(str(x) for x in c.get('cs_latencies', []))  + "]", self.data[19])
-        p(20, "WE  Latencies",         "[" + ", ".join(str(x) for x in c.get('we_latencies', []))  + "]", self.data[20])
-        p(21, "Module Features",       c.get("module_features", {}),            self.data[21])
-        p(22, "Chip Features",         c.get("chip_features", {}),              self.data[22])
-        p(31, "Module Density Bitmap", c.get("module_density_bitmap", []),      self.data[31])
-        p(32, "Addr/Cmd setup/hold",   f"{c.get('addr_cmd_setup_ns',0)} / {c.get('addr_cmd_hold_ns',0)} ns", self.data[32])
-        p(34, "DIN  setup/hold",       f"{c.get('din_setup_ns',0)} / {c.get('din_hold_ns',0)} ns",           self.data[34])
+        p(16, "Burst Lengths",         "[" + ", ".join(str(x) for x in bl) + "]", raw[16])
+        p(18, "CAS Latencies",         "[" + ", ".join(str(x) for x in c.get('cas_latencies', [])) + "]", raw[18])
+        p(19, "CS  Latencies",         "[" + ", ".join(str(x) for x in c.get('cs_latencies', []))  + "]", raw[19])
+        p(20, "WE  Latencies",         "[" + ", ".join(str(x) for x in c.get('we_latencies', []))  + "]", raw[20])
+        p(21, "Module Features",       c.get("module_features", {}),            raw[21])
+        p(22, "Chip Features",         c.get("chip_features", {}),              raw[22])
+        p(31, "Module Density Bitmap", c.get("module_density_bitmap", []),      raw[31])
+        p(32, "Addr/Cmd setup/hold",   f"{c.get('addr_cmd_setup_ns',0)} / {c.get('addr_cmd_hold_ns',0)} ns", raw[32])
+        p(34, "DIN  setup/hold",       f"{c.get('din_setup_ns',0)} / {c.get('din_hold_ns',0)} ns",           raw[34])
 
         # --- Manufacturing ---
         print("\n--- Manufacturing ---")
-        p((64,71), "JEDEC IDs",        m.get("jedec_ids_readable","") or "<unknown>", self.data[64:72])
-        p(72,      "Location Code",    f"0x{m.get('location_code',0):02X}",      self.data[72])
-        p((73,90), "Part Number",      f"'{m.get('part_number','Unknown')}'",    self.data[73:91])
-        p((91,92), "Revision Code",    f"0x{m.get('rev_lo',0):02X} 0x{m.get('rev_hi',0):02X}", self.data[91:93])
-        p((93,94), "Manufacture Date", m.get("manufacture_date",""),             self.data[93:95])
-        p((95,98), "Serial Number",    m.get("serial_number_hex",""),            self.data[95:99])
+        p((64,71), "JEDEC IDs",        m.get("jedec_ids_readable","") or "<unknown>", raw[64:72])
+        p(72,      "Location Code",    f"0x{m.get('location_code',0):02X}",      raw[72])
+        p((73,90), "Part Number",      f"'{m.get('part_number','Unknown')}'",    raw[73:91])
+        p((91,92), "Revision Code",    f"0x{m.get('rev_lo',0):02X} 0x{m.get('rev_hi',0):02X}", raw[91:93])
+        p((93,94), "Manufacture Date", m.get("manufacture_date",""),             raw[93:95])
+        p((95,98), "Serial Number",    m.get("serial_number_hex",""),            raw[95:99])
 
         # --- SPD Checksum ---
         print("\n--- SPD Checksum ---")
         if crc:
             p(63, "Stored / Computed",
-            f"0x{crc.get('stored',0):02X} / 0x{crc.get('computed',0):02X}  ({crc.get('coverage','')})  [{crc.get('status','')}]", self.data[63])
+            f"0x{crc.get('stored',0):02X} / 0x{crc.get('computed',0):02X}  ({crc.get('coverage','')})  [{crc.get('status','')}]", raw[63])
         
         warnings = data.get("warnings", [])
         if warnings:
@@ -463,43 +574,8 @@ class SDRDecoder:
 
     def dump_field_map(self) -> str:
         """Optional: raw field map for 'diff --show-maps' parity with DDR3."""
-        segs = [
-            (0, 0,  "Bytes Present"),
-            (1, 1,  "EEPROM log2 size"),
-            (2, 2,  "Memory Type"),
-            (3, 3,  "Row bits (B2|B1)"),
-            (4, 4,  "Col bits (B2|B1)"),
-            (5, 5,  "Banks on Module"),
-            (6, 7,  "Module Data Width"),
-            (8, 8,  "Interface Voltage"),
-            (9, 10, "tCK/tAC @ highest CL"),
-            (11,11, "DIMM config"),
-            (12,12, "Refresh rate"),
-            (13,14, "Primary/ECC SDRAM width"),
-            (15,15, "Random read clock delay"),
-            (16,16, "Burst lengths"),
-            (17,17, "Banks per SDRAM"),
-            (18,20, "CAS/CS/WE bitmaps"),
-            (21,21, "Module features"),
-            (22,22, "Chip features"),
-            (23,26, "tCK/tAC @ medium/short CL"),
-            (27,30, "tRP/tRRD/tRCD/tRAS"),
-            (31,31, "Module density bitmap"),
-            (32,35, "AC/ADDR/DIN setup/hold"),
-            (62,62, "SPD revision"),
-            (63,63, "Checksum"),
-            (64,71, "JEDEC IDs"),
-            (72,72, "Mfg location"),
-            (73,90, "Part number"),
-            (91,92, "Module revision"),
-            (93,94, "Mfg date YY/WW"),
-            (95,98, "Serial number"),
-            (99,125,"Vendor-specific"),
-            (126,127,"Intel extensions"),
-        ]
-        lines = []
-        for start, end, name in segs:
-            seg = self.data[start:end+1]
-            hexs = ' '.join(f"{b:02X}" for b in seg)
-            lines.append(f"{start:03d}-{end:03d}  {name:<26} {hexs}")
-        return "\n".join(lines)
\ No newline at end of file
+        data = self.data
+        return "\n".join(
+            f"{start:03d}-{end:03d}  {name} {data[start:end+1].hex(' ').upper()}"
+            for start, end, name in _FIELD_MAP_SEGS
+        )
\ No newline at end of file
@@ -5,16 +5,20 @@
 # keep a SQLite DB, and (optionally) generate an index.html.
 # Now catalogs SPDs regardless of checksum validity and records stored vs computed CRC(s).
 
-import argparse, os, sys, shutil, json, sqlite3, hashlib, time, html, re
+import argparse, os, sys, shutil, json, sqlite3, hashlib, time, html, re, binascii
 from typing import List, Optional, Tuple
 from collections import defaultdict
 from datetime import datetime, UTC
-import shlex, subprocess, tempfile
+import shlex, subprocess, tempfile, bisect, struct, multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from functools import lru_cache
 
 # --- New Import from hp_smartmemory_ident ---
 # Assuming hp_smartmemory_ident.py is in the same directory or on the python path
 try:
-    from hp_smartmemory_ident import load_registry, digits_to_u32_pn, compute_hpt_solutions, u32
+    from hp_smartmemory_ident import (load_registry, digits_to_u32_pn, compute_hpt_solutions, u32,
+                                      family_inverse)
 except ImportError:
     sys.stderr.write("[WARN] hp_smartmemory_ident.py not found. HPT validation will be disabled.\n")
     # Define dummy functions to prevent crashes when the import fails
@@ -22,6 +26,7 @@ except ImportError:
     def digits_to_u32_pn(pn: str) -> int: return 0
     def compute_hpt_solutions(serial: int, fam: dict) -> list[int]: return []
     def u32(x: int) -> int: return x & 0xFFFFFFFF
+    def family_inverse(fam: dict, B: int) -> int: return pow(B, -1, 1 << 32)
 
 
 def json_sibling_path(spd_path: str) -> str:
@@ -36,23 +41,46 @@ def _is_valid_json_file(path: str) -> bool:
     except Exception:
         return False
     
+@lru_cache(maxsize=4096)
 def _norm_pn(s: str) -> str:
     s = (s or "").strip()
     s = re.sub(r"\s+", " ", s)
     return s.replace(" ", "").replace("-", "").upper()
 
 def _build_reverse_map(reg: dict) -> dict:
-    rev = {}
+    return {_norm_pn(eq): (hp_key, fam)
+            for hp_key, fam in reg.items()
+            for eq in fam.get("equivalents", []) or []}
+
+def _build_hpt_families(reg: dict) -> list:
+    """
+    Parse each family's A/B/K once at load time: [(hp_key, fam, A, B, K)].
+    Families with missing/invalid constants or B == 0 have no HPT solutions
+    and are left out.
+    """
+    fams = []
     for hp_key, fam in reg.items():
-        for eq in fam.get("equivalents", []) or []:
-            rev[_norm_pn(eq)] = (hp_key, fam)
-    return rev
+        try:
+            A, B, K = (int(fam[k], 16) for k in ("A", "B", "K"))
+        except (KeyError, TypeError, ValueError):
+            continue
+        if B:
+            fams.append((hp_key, fam, A, B, K))
+    return fams
+
+def _build_hpt_params(fams: list) -> dict:
+    """
+    hp_key -> (A, B, K, invB) for every family with odd B, i.e. exactly one
+    HPT per serial. The inverse is taken once here instead of per SPD.
+    """
+    return {hp_key: (A, B, K, family_inverse(fam, B))
+            for hp_key, fam, A, B, K in fams if B & 1}
 
 def _resolve_hp_family(
     vendor_pn: str,
     serial_u32: int,
     hpt_u32: Optional[int],
-    reg: dict,
+    fams: list,
     rev: dict
 ) -> Tuple[Optional[str], Optional[dict]]:
     """
@@ -65,15 +93,39 @@ def _resolve_hp_family(
     if key in rev:
         return rev[key]
     if hpt_u32 is not None and serial_u32:
-        for hp_key, fam in reg.items():
-            solutions = compute_hpt_solutions(serial_u32, fam)
-            if hpt_u32 in solutions:
+        # hpt is among a family's solutions exactly when it satisfies the
+        # relation, so test that directly rather than solving per family.
+        for hp_key, fam, A, B, K in fams:
+            if u32(A * serial_u32 + B * hpt_u32) == K:
                 return hp_key, fam
     return None, None
 
+_spd_tool_mods = {}
+
+def _load_spd_tool(spd_tool: str):
+    """Import spd_tool.py from its path once; None if it cannot be imported."""
+    if spd_tool not in _spd_tool_mods:
+        mod = None
+        try:
+            import importlib.util
+            tool_dir = os.path.dirname(os.path.abspath(spd_tool))
+            if tool_dir not in sys.path:
+                sys.path.insert(0, tool_dir)  # for its spd_library/spd_smbus imports
+            spec = importlib.util.spec_from_file_location("_spd_tool", spd_tool)
+            mod = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(mod)
+            if not hasattr(mod, "dump_to_dict"):
+                mod = None
+        except Exception:
+            mod = None
+        _spd_tool_mods[spd_tool] = mod
+    return _spd_tool_mods[spd_tool]
+
 def ensure_spd_json(spd_tool: str, spd_path: str, json_path: str,
                     extra_args: str = "", verbose: bool = False) -> bool:
     """
+    Fast path: import spd_tool.py once and call its dump_to_dict() in-process
+    (only without extra_args, which the in-process call cannot honour).
     Primary (robust): get JSON on stdout and write it ourselves:
         python spd_tool.py dump --spd <spd_path> --json - [extra_args]
     Fallback: ask tool to write the file itself (if it truly supports it):
@@ -85,7 +137,27 @@ def ensure_spd_json(spd_tool: str, spd_path: str, json_path: str,
         if not need:
             return True
 
-        os.makedirs(os.path.dirname(json_path), exist_ok=True)
+        ensure_dir(json_path)
+
+        # --- FAST: in-process, no interpreter start-up per SPD
+        mod = None if extra_args.strip() else _load_spd_tool(spd_tool)
+        if mod is not None:
+            try:
+                text = json.dumps(mod.dump_to_dict(spd_path), indent=2,
+                                  ensure_ascii=False, default=mod._json_default)
+            except (NotImplementedError, ValueError, FileNotFoundError) as e:
+                # spd_tool's main turns these into "Error: ..." and exit 1;
+                # report them the same way without starting an interpreter
+                sys.stderr.write(f"[WARN] spd_tool failed for {spd_path}:\nError: {e}\n\n")
+                return False
+            except Exception as e:
+                # Anything else: let the subprocess path below report it
+                if verbose:
+                    sys.stderr.write(f"[SPD-TOOL] in-process dump failed ({e}); using subprocess.\n")
+            else:
+                with open(json_path, "w", encoding="utf-8") as f:
+                    f.write(text)
+                return True
 
         # --- PRIMARY: stdout JSON
         cmd = [sys.executable, spd_tool, "dump", "--spd", spd_path, "--json", "-"]
@@ -153,6 +225,51 @@ def ensure_spd_json(spd_tool: str, spd_path: str, json_path: str,
         sys.stderr.write(f"[WARN] Could not create JSON for {spd_path}: {e}\n")
     return False
 
+def sidecar_due(json_mtimes: dict, json_path: str, spd_path: str) -> bool:
+    """
+    Replays ensure_spd_json's mtime check as if the dump ran right now, for
+    dumps deferred until after the scan. json_mtimes holds the sidecar time
+    so far (None = missing); a due dump counts as written at the current time,
+    so a later SPD sharing the sidecar only wins if it is newer than that
+    (freshly extracted, not a moved original keeping its old mtime).
+    """
+    if json_path in json_mtimes:
+        last = json_mtimes[json_path]
+    else:
+        last = os.path.getmtime(json_path) if os.path.exists(json_path) else None
+    try:
+        due = last is None or last < os.path.getmtime(spd_path)
+    except OSError:
+        due = True  # let ensure_spd_json report it
+    json_mtimes[json_path] = time.time() if due else last
+    return due
+
+def ensure_spd_jsons(spd_tool: str, pending: dict, extra_args: str = "",
+                     verbose: bool = False, jobs: int = 1):
+    """
+    Run ensure_spd_json for every {json_path: [spd_path, ...]}: the SPD the
+    inline mtime check would have used, then later SPDs sharing the sidecar,
+    tried in order only while dumps fail (as a missing sidecar made them due).
+    With jobs > 1 distinct sidecars overlap on a thread pool, which pays off
+    for the subprocess route (process spawn and pipe I/O release the GIL); the
+    in-process decoder is imported up front so threads share one module.
+    """
+    def run(item):
+        json_path, spd_paths = item
+        for spd_path in spd_paths:
+            if ensure_spd_json(spd_tool, spd_path, json_path, extra_args=extra_args, verbose=verbose):
+                break
+
+    items = list(pending.items())
+    if jobs <= 1 or len(items) < 2:
+        for item in items:
+            run(item)
+        return
+    if not extra_args.strip():
+        _load_spd_tool(spd_tool)
+    with ThreadPoolExecutor(max_workers=jobs) as ex:
+        list(ex.map(run, items))
+
 
 # ---------------------- SPD constants ----------------------
 SPD128 = 128
@@ -167,49 +284,57 @@ MEM_TYPES = {MEM_SDR: "SDR", MEM_DDR1: "DDR", MEM_DDR2: "DDR2", MEM_DDR3: "DDR3"
 
 # --- 8-bit SPD checksums (legacy base at 63, optional ext at 95) ---
 def checksum8(data: bytes) -> int:
+    # sum() over bytes is a C-level walk of cached small ints; iterating a
+    # memoryview is roughly twice as slow, so copy views out first.
+    if type(data) is not bytes:
+        data = bytes(data)
     return sum(data) & 0xFF
 
 # CRC-8 (polynomial 0x07) used by SDR/DDR SPD
+def _crc8_jedec_byte(crc: int) -> int:
+    for _ in range(8):
+        crc = ((crc << 1) ^ 0x07) & 0xFF if (crc & 0x80) else ((crc << 1) & 0xFF)
+    return crc
+
+_CRC8_JEDEC_TBL = bytes(_crc8_jedec_byte(i) for i in range(256))
+
 def crc8_jedec(data: bytes, init: int = 0x00) -> int:
     crc = init & 0xFF
+    tbl = _CRC8_JEDEC_TBL
     for b in data:
-        crc ^= b
-        for _ in range(8):
-            crc = ((crc << 1) ^ 0x07) & 0xFF if (crc & 0x80) else ((crc << 1) & 0xFF)
+        crc = tbl[crc ^ b]
     return crc
 
 # ---------------------- CRC helpers ------------------------
 def crc16_xmodem(data: bytes, init: int = 0x0000) -> int:
-    crc = init & 0xFFFF
-    for b in data:
-        crc ^= (b << 8) & 0xFFFF
-        for _ in range(8):
-            if crc & 0x8000:
-                crc = ((crc << 1) ^ 0x1021) & 0xFFFF
-            else:
-                crc = (crc << 1) & 0xFFFF
-    return crc
+    # binascii.crc_hqx is CRC-CCITT (poly 0x1021, MSB-first, no reflection or
+    # final xor), i.e. exactly XMODEM given the same init, computed in C.
+    return binascii.crc_hqx(data, init & 0xFFFF)
+
+_U16LE = struct.Struct("<H").unpack_from
+_U32LE = struct.Struct("<I").unpack_from
+_U32BE = struct.Struct(">I").unpack_from
 
 def le16(b: bytes, off: int) -> int:
-    return b[off] | (b[off+1] << 8)
+    return _U16LE(b, off)[0]
+
+def _fmt_u32(v: int) -> str:
+    return "0x%08X" % v
 
 # ---------------------- Utility helpers --------------------
 def sha256_hex(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
+# \w is exactly str.isalnum() plus '_', which maps to itself anyway
+_UNSAFE_NAME_RE = re.compile(r"[^\w.\-+()\[\]{} ]")
+
 def safe_name(s: str, maxlen: int = 80) -> str:
     s = s.strip().replace("\x00", "")
-    s = "".join(ch if ch.isalnum() or ch in "._-+()[]{} " else "_" for ch in s)
+    s = _UNSAFE_NAME_RE.sub("_", s)
     s = "_".join(s.split())
     return s[:maxlen] if len(s) > maxlen else s
 
-def file_sha256(path: str) -> str:
-    h = hashlib.sha256()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(1 << 20), b""):
-            h.update(chunk)
-    return h.hexdigest()
-
+@lru_cache(maxsize=4096)
 def vendor_from_id(bank: int, code: int) -> str:
     return f"JEDEC(b{bank:02X},c{code:02X})"
 
@@ -272,7 +397,7 @@ def parse_legacy_common(block: bytes, mem_type_label: str) -> dict:
     yr = 2000 + yr_raw if yr_raw < 100 else int(yr_raw)
     serial = 0
     if len(block) >= 99:
-        serial = int.from_bytes(block[95:99], 'little')
+        serial = _U32LE(block, 95)[0]
 
     sb, cb, se, ce, st = legacy_crc_pair(block)
 
@@ -294,16 +419,18 @@ def parse_legacy_common(block: bytes, mem_type_label: str) -> dict:
     }
     return meta
 
+_ZERO31 = bytes(31)
+
 def parse_sdr(block: bytes) -> dict:
     bank, code = (block[64], block[65]) if len(block) > 65 else (0, 0)
     pn = block[73:91].rstrip(b"\x00").decode("ascii", errors="replace").rstrip('\x00').strip() if len(block) >= 91 else ""
-    serial = int.from_bytes(block[95:99], "little", signed=False) if len(block) >= 99 else 0
+    serial = _U32LE(block, 95)[0] if len(block) >= 99 else 0
 
     s_base = block[63]
     c_base = checksum8(block[0:63])
 
     ext_region = block[64:95]
-    has_ext_payload = any(b != 0x00 for b in ext_region)
+    has_ext_payload = ext_region != _ZERO31  # single memcmp; blocks are >= 128B
     s_ext = block[95] if len(block) > 95 else 0
     c_ext = checksum8(ext_region) if has_ext_payload else None
 
@@ -342,7 +469,7 @@ def ddr3_crc_pair(block: bytes) -> tuple[int|None, int|None, str]:
     return (stored, computed, status)
 
 def parse_ddr3(block: bytes) -> dict:
-    serial = int.from_bytes(block[122:126], 'big')
+    serial = _U32BE(block, 122)[0]
     wk, yr = block[120], 2000 + (block[121] & 0xFF)
     pn = ""
     if len(block) >= 146:
@@ -382,7 +509,7 @@ def ddr4_crc_info(block: bytes) -> tuple[int|None,int|None,int|None,int|None,str
 def parse_ddr4(block: bytes) -> dict:
     bank, code = block[320], block[321]
     pn = block[329:349].rstrip(b"\x00").decode("ascii", errors="replace")
-    serial = int.from_bytes(block[325:329], 'little')
+    serial = _U32LE(block, 325)[0]
     s_b, c_b, s_e, c_e, st = ddr4_crc_info(block)
     return {
         "mem_type": "DDR4",
@@ -404,7 +531,7 @@ def parse_ddr2(block: bytes) -> dict:
     pn = block[128:146].rstrip(b"\x00").decode("ascii", errors="replace")
     if not pn:
         pn = block[73:91].rstrip(b"\x00").decode("ascii", errors="replace")
-    serial = int.from_bytes(block[122:126], 'little')
+    serial = _U32LE(block, 122)[0]
     return {
         "mem_type": "DDR2",
         "serial_u32": serial,
@@ -415,94 +542,202 @@ def parse_ddr2(block: bytes) -> dict:
     }
 
 # ---------------------- HP HPT tag -------------------------
-def extract_hp_hpt(block: bytes):
+# b"HPT" cannot overlap itself, so finditer reports every occurrence
+_HPT_TAG_RE = re.compile(b"HPT")
+
+def find_hpt_tags(data: bytes) -> List[int]:
+    """Offsets of every b'HPT' in the whole buffer, found in one C-level sweep."""
+    return [m.start() for m in _HPT_TAG_RE.finditer(data)]
+
+def extract_hp_hpt(data: bytes, off: int, size: int, hpt_hits: List[int]):
     """
-    Finds the 'HPT' prefix and extracts the 4-byte code that follows
+    Finds the first 'HPT' prefix inside the window data[off:off+size] (using
+    hpt_hits from find_hpt_tags) and extracts the 4-byte code that follows
     the 4-byte tag area (e.g., 'HPT ' or 'HPT\x00').
     """
-    tag_prefix = b"HPT"
-    idx = block.find(tag_prefix)
-
-    if idx < 0 or idx + 8 > len(block):
+    i = bisect.bisect_left(hpt_hits, off)
+    if i == len(hpt_hits):
+        return None
+    hit = hpt_hits[i]
+    if hit + 8 > off + size:
         return None
 
-    hpt_bytes = block[idx + 4 : idx + 8]
-    hpt = int.from_bytes(hpt_bytes, 'big')
+    hpt = _U32BE(data, hit + 4)[0]
 
     return {
-        "hpt_tag_offset_in_spd": idx,
+        "hpt_tag_offset_in_spd": hit - off,
         "hpt_code_u32": hpt,
-        "hpt_code_hex": f"0x{hpt:08X}"
+        "hpt_code_hex": _fmt_u32(hpt)
     }
 
 # ---------------------- Scanning logic ---------------------
-def scan_windows(data: bytes, size: int, step: int):
+# Starting a process pool costs ~10 ms (more under spawn) while anchored
+# scanning handles small dumps in ~20 us each and blobs at >10 MB/s, so the
+# pool is only used once this many bytes actually need scanning.
+SCAN_POOL_MIN_BYTES = 1 << 20
+
+def _type_anchors(data: bytes, size: int, step: int, mem_types) -> List[int]:
+    """
+    Offsets of windows whose memory-type byte (offset 2) is one of mem_types.
+    Every looks_like_* predicate requires that byte, so locating it with
+    bytes.find skips the Python-level visit to every other window.
+    """
     end = len(data) - size + 1
-    for off in range(0, max(0, end), step):
-        yield off, data[off:off+size]
+    offs = []
+    for t in mem_types:
+        needle = bytes((t,))
+        i = data.find(needle, 2)
+        while i != -1:
+            off = i - 2
+            if off >= end:
+                break
+            if off % step == 0:
+                offs.append(off)
+            i = data.find(needle, i + 1)
+    offs.sort()
+    return offs
+
+def _parse_window(window) -> Optional[Tuple[bytes, dict]]:
+    """
+    Classify a window (bytes or memoryview) and parse it. Returns the window
+    materialized as bytes plus its metadata, or None if it is not an SPD.
+    """
+    # The size checks inside each looks_like_* keep DDR4 to 512B windows and
+    # DDR2 to 256B ones, so one dispatch order serves every window size.
+    if looks_like_ddr4(window):
+        parse = parse_ddr4
+    elif looks_like_ddr3(window):
+        parse = parse_ddr3
+    elif looks_like_ddr2_spd(window):
+        parse = parse_ddr2
+    elif looks_like_ddr1(window):
+        parse = parse_ddr1
+    elif looks_like_sdr(window):
+        parse = parse_sdr
+    else:
+        return None
+    block = bytes(window)
+    return block, parse(block)
 
-def scan_file_for_spd(path: str, step: int) -> List[dict]:
+def scan_file_for_spd(path: str, step: int, known: Optional[Tuple[list, Optional[str]]] = None) -> Tuple[Optional[str], List[dict]]:
+    """
+    Scan one file for SPD windows; returns (file_sha256, results). The hash
+    is taken from the buffer already read for scanning, and only when
+    something was found. `known` is a scan-cache hit (hits, sha256): only the
+    listed (offset, size) windows are re-parsed and the cached hash is reused
+    (no hits means the file is known to hold none and is not even opened).
+    """
     results = []
+    if known is not None:
+        known, known_sha = known
+        if not known:
+            return None, results
     try:
         with open(path, "rb") as f:
             data = f.read()
     except Exception as e:
         sys.stderr.write(f"[WARN] Could not read {path}: {e}\n")
-        return results
+        return None, results
 
-    n = len(data)
+    # One sweep for HPT tags; the usual case of none costs a single find.
+    hpt_hits = find_hpt_tags(data)
 
-    # DDR4 (512B)
-    for off, block in scan_windows(data, SPD512, step):
-        if looks_like_ddr4(block):
-            meta = parse_ddr4(block)
-            hpt = extract_hp_hpt(block)
+    def _add(out, off, size, block, meta):
+        if hpt_hits:
+            hpt = extract_hp_hpt(data, off, size, hpt_hits)
             if hpt: meta.update(hpt)
-            results.append({"file": path, "file_offset": off, "spd_size": SPD512, "raw": block, **meta})
-
-    # 256B windows: DDR3, DDR2, DDR1, SDR (in that order)
-    for off, block in scan_windows(data, SPD256, step):
-        if looks_like_ddr3(block):
-            meta = parse_ddr3(block)
-        elif looks_like_ddr2_spd(block):
-            meta = parse_ddr2(block)
-        elif looks_like_ddr1(block):
-            meta = parse_ddr1(block)
-        elif looks_like_sdr(block):
-            meta = parse_sdr(block)
-        else:
+        out.append({"file": path, "file_offset": off, "spd_size": size, "raw": block, **meta})
+
+    if known is not None:
+        mv = memoryview(data)
+        for off, size in known:
+            parsed = _parse_window(mv[off:off+size])
+            if parsed is not None:
+                _add(results, off, size, *parsed)
+        if results and not known_sha:
+            known_sha = sha256_hex(data)
+        return (known_sha if results else None), results
+
+    # Single pass over the type-byte anchors; the type byte picks the one
+    # window size worth trying. DDR4 is 512B; DDR3/DDR2/DDR1/SDR are 256B,
+    # or 128B only in files too short to hold a 256B image.
+    n = len(data)
+    legacy = SPD256 if n >= SPD256 else SPD128
+    sizes = {MEM_DDR4: SPD512, MEM_DDR3: legacy, MEM_DDR2: SPD256,
+             MEM_DDR1: legacy, MEM_SDR: legacy}
+    mv = memoryview(data)
+    ddr4 = []  # DDR4 hits are listed ahead of the smaller images
+    for off in _type_anchors(data, SPD128, step, sizes):
+        size = sizes[data[off + 2]]
+        if off + size > n:
             continue
-        hpt = extract_hp_hpt(block)
-        if hpt: meta.update(hpt)
-        results.append({"file": path, "file_offset": off, "spd_size": SPD256, "raw": block, **meta})
-
-    # 128B windows: DDR3, DDR1, SDR (avoid duplicates if larger blocks exist)
-    if 128 <= n < 256:
-        for off, block in scan_windows(data, SPD128, step):
-            if looks_like_ddr3(block):
-                meta = parse_ddr3(block)
-            elif looks_like_ddr1(block):
-                meta = parse_ddr1(block)
-            elif looks_like_sdr(block):
-                meta = parse_sdr(block)
-            else:
-                continue
-            hpt = extract_hp_hpt(block)
-            if hpt: meta.update(hpt)
-            results.append({"file": path, "file_offset": off, "spd_size": SPD128, "raw": block, **meta})
+        parsed = _parse_window(mv[off:off+size])
+        if parsed is not None:
+            _add(ddr4 if size == SPD512 else results, off, size, *parsed)
 
-    return results
+    results[:0] = ddr4
+    return (sha256_hex(data) if results else None), results
 
 
+def scan_files(paths: List[str], step: int, jobs: int, known: Optional[list] = None):
+    """
+    Yield (path, file_sha256, matches) for each path, in input order. Files are independent,
+    so with jobs > 1 the scans fan out over a process pool while the caller
+    stays the single writer for the filesystem and DB. `known` optionally
+    carries per-path cached hits (see scan_file_for_spd).
+    """
+    if known is None:
+        known = [None] * len(paths)
+    if jobs <= 1 or len(paths) < 2:
+        for p, k in zip(paths, known):
+            yield (p, *scan_file_for_spd(p, step, k))
+        return
+    # Prefer fork where available: workers inherit the imported module and its
+    # lookup tables copy-on-write instead of re-importing this script each.
+    ctx = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=ctx) as ex:
+        for p, res in zip(paths, ex.map(scan_file_for_spd, paths, repeat(step), known, chunksize=16)):
+            yield (p, *res)
+
+
+class _RootFile:
+    """DirEntry stand-in for a single file given directly on the command line."""
+    __slots__ = ("path", "name")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+
+    def stat(self):
+        return os.stat(self.path)
+
 def walk_paths(root: str, recursive: bool):
+    """
+    Yield os.DirEntry objects for every non-directory under root, in the same
+    order os.walk would list them (a directory's files, then its
+    subdirectories depth-first; symlinked directories are not followed).
+    Entries carry name/path and cache stat(), so callers avoid extra stats.
+    """
     if os.path.isfile(root):
-        yield root
+        yield _RootFile(root)
         return
-    for base, dirs, files in os.walk(root):
-        for fn in files:
-            yield os.path.join(base, fn)
-        if not recursive:
-            break
+    try:
+        it = os.scandir(root)
+    except OSError:
+        return
+    subdirs = []
+    with it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if not is_dir:
+                yield entry
+            elif recursive and not entry.is_symlink():
+                subdirs.append(entry.path)
+    for d in subdirs:
+        yield from walk_paths(d, recursive)
 
 # ---------------------- SQLite catalog --------------------
 DDL = """
@@ -538,19 +773,48 @@ CREATE TABLE IF NOT EXISTS spd (
     spd_sha256 TEXT NOT NULL,
     UNIQUE(spd_sha256)
 );
+CREATE TABLE IF NOT EXISTS scan_cache (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    step INTEGER NOT NULL,
+    sha256 TEXT,
+    hits TEXT NOT NULL, -- JSON list of [file_offset, spd_size]
+    last_scanned INTEGER NOT NULL
+);
+"""
+
+# Secondary indexes are kept apart so bulk loads can build them once at the end
+INDEX_DDL = """
 CREATE INDEX IF NOT EXISTS idx_mem_vendor ON spd(mem_type, vendor);
 CREATE INDEX IF NOT EXISTS idx_serial ON spd(serial_u32);
 CREATE INDEX IF NOT EXISTS idx_hpt ON spd(hpt_u32);
 """
 
-def db_connect(path: str):
-    conn = sqlite3.connect(path)
+def db_tune(conn: sqlite3.Connection):
+    """WAL with deferred fsync and a large in-memory cache for bulk writes."""
     conn.execute("PRAGMA journal_mode=WAL;")
     conn.execute("PRAGMA synchronous=NORMAL;")
-    for stmt in DDL.strip().split(";"):
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA cache_size=-65536;")      # 64 MiB page cache
+    conn.execute("PRAGMA mmap_size=268435456;")    # 256 MiB memory-mapped I/O
+
+def db_connect(path: str, indexes: bool = True):
+    conn = sqlite3.connect(path)
+    db_tune(conn)
+    _run_ddl(conn, DDL)
+    if indexes:
+        db_create_indexes(conn)
+    return conn
+
+def _run_ddl(conn: sqlite3.Connection, ddl: str):
+    for stmt in ddl.strip().split(";"):
         s = stmt.strip()
         if s: conn.execute(s)
-    return conn
+
+def db_create_indexes(conn: sqlite3.Connection):
+    _run_ddl(conn, INDEX_DDL)
+    conn.commit()
 
 def db_migrate(conn: sqlite3.Connection):
     # Add missing columns if the DB pre-dates CRC fields, etc.
@@ -577,23 +841,73 @@ def db_migrate(conn: sqlite3.Connection):
     # (No-op if they already exist)
     conn.commit()
 
+_UPSERT_COLS = ("added_ts","src_path","src_sha256","file_offset","spd_size","mem_type",
+                "vendor","vendor_bank","vendor_code","part_number","serial_u32",
+                "crc_status","stored_crc","computed_crc",
+                "stored_crc_base","computed_crc_base","stored_crc_ext","computed_crc_ext",
+                "hpt_hex","hpt_u32", "hpt_status", "computed_hpt_u32", "hp_part_number", "dest_path","json_path","spd_sha256")
+
+# On conflict, refresh ALL mutable columns so old rows get backfilled
+_UPSERT_SQL = f"""
+    INSERT INTO spd ({",".join(_UPSERT_COLS)}) VALUES ({",".join("?"*len(_UPSERT_COLS))})
+    ON CONFLICT(spd_sha256) DO UPDATE SET
+      {", ".join(f"{c}=excluded.{c}" for c in _UPSERT_COLS if c != "spd_sha256")}
+"""
+
+# "WHERE true" keeps SQLite from parsing ON CONFLICT as a join constraint
+_BULK_COPY_SQL = f"""
+    INSERT INTO disk.spd ({",".join(_UPSERT_COLS)})
+    SELECT {",".join(_UPSERT_COLS)} FROM main.spd WHERE true
+    ON CONFLICT(spd_sha256) DO UPDATE SET
+      {", ".join(f"{c}=excluded.{c}" for c in _UPSERT_COLS if c != "spd_sha256")}
+"""
+
+def _row_to_tuple(row: dict) -> tuple:
+    """Row dict -> parameter tuple in _UPSERT_COLS order."""
+    return tuple(row.get(c) for c in _UPSERT_COLS)
+
 def db_upsert(conn, row: dict):
-    cols = ("added_ts","src_path","src_sha256","file_offset","spd_size","mem_type",
-            "vendor","vendor_bank","vendor_code","part_number","serial_u32",
-            "crc_status","stored_crc","computed_crc",
-            "stored_crc_base","computed_crc_base","stored_crc_ext","computed_crc_ext",
-            "hpt_hex","hpt_u32", "hpt_status", "computed_hpt_u32", "hp_part_number", "dest_path","json_path","spd_sha256")
-    vals = tuple(row.get(c) for c in cols)
+    conn.execute(_UPSERT_SQL, _row_to_tuple(row))
+
+def db_upsert_many(conn, tuples: List[tuple]):
+    """Upsert pre-built _row_to_tuple() tuples in one transaction."""
+    if not tuples:
+        return
+    with conn:
+        conn.executemany(_UPSERT_SQL, tuples)
 
-    # On conflict, refresh ALL mutable columns so old rows get backfilled
-    update_cols = [c for c in cols if c not in ("spd_sha256",)]  # keep the unique key
-    set_clause = ", ".join(f"{c}=excluded.{c}" for c in update_cols)
 
-    conn.execute(f"""
-        INSERT INTO spd ({",".join(cols)}) VALUES ({",".join("?"*len(cols))})
-        ON CONFLICT(spd_sha256) DO UPDATE SET
-          {set_clause}
-    """, vals)
+def scan_cache_load(conn) -> dict:
+    """path -> (size, mtime_ns, step, sha256, hits) for every cached file."""
+    return {r[0]: r[1:] for r in conn.execute(
+        "SELECT path, size, mtime_ns, step, sha256, hits FROM scan_cache")}
+
+def scan_cache_store(conn, entries: List[tuple]):
+    """entries: (path, size, mtime_ns, step, sha256, hits_json, last_scanned)."""
+    if not entries:
+        return
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO scan_cache VALUES (?,?,?,?,?,?,?)", entries)
+
+def db_bulk_import(db_path: str, rows: List[tuple]):
+    """
+    Stage rows in a :memory: DB, then ATTACH the on-disk catalog and copy them
+    over with a single INSERT ... SELECT, so the disk sees one sequential
+    write. Rows keep their on-disk ids and are upserted by spd_sha256 exactly
+    as db_upsert_many would.
+    """
+    if not rows:
+        return
+    mem = sqlite3.connect(":memory:")
+    try:
+        _run_ddl(mem, DDL)  # staging only needs the UNIQUE key for upserts
+        db_upsert_many(mem, rows)
+        mem.execute("ATTACH DATABASE ? AS disk", (db_path,))
+        with mem:
+            mem.execute(_BULK_COPY_SQL)
+        mem.execute("DETACH DATABASE disk")
+    finally:
+        mem.close()
 
 
 # ---------------------- Organizing / moving ---------------
@@ -604,21 +918,36 @@ def dest_rel_path(mem_type: str, vendor: str, part_number: str, serial_hex: str,
         base += f"__{hpt_hex}"
     return os.path.join(folder, f"{base}.{suffix}")
 
+_made_dirs = set()
+
 def ensure_dir(path: str):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
+    """Create the parent directory of `path`, once per directory per run."""
+    d = os.path.dirname(path)
+    if d not in _made_dirs:
+        os.makedirs(d, exist_ok=True)
+        _made_dirs.add(d)
 
-def write_index_html(out_dir: str, rows: List[dict], html_path: str):
-    rows_sorted = sorted(rows, key=lambda r: (r["mem_type"], r["vendor"], r["part_number"], r["serial_u32"]))
-    now = datetime.now(UTC).strftime("%Y-%m-%d %H:%M UTC")
-    with open(html_path, "w", encoding="utf-8") as f:
-        f.write("<!doctype html><html><head><meta charset='utf-8'>"
-                "<title>SPD Index</title>"
-                "<style>body{font-family:system-ui,Arial,sans-serif}"
-                "table{border-collapse:collapse;width:100%}"
-                "th,td{border:1px solid #ddd;padding:6px}th{background:#f3f3f3;text-align:left}"
-                "code{font-family:ui-monospace,Consolas,monospace}</style>"
-                "</head><body>")
-        f.write("""
+def open_new(path: str):
+    """
+    Create `path` exclusively and return it open for binary writing, or None
+    if it already exists: one open() instead of an exists() probe plus open,
+    and no window for another writer in between.
+    """
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+    except FileExistsError:
+        return None
+    return os.fdopen(fd, "wb")
+
+# Static head of index.html (styles + spec viewer modal/JS), encoded once
+_INDEX_PREAMBLE = ("<!doctype html><html><head><meta charset='utf-8'>"
+                  "<title>SPD Index</title>"
+                  "<style>body{font-family:system-ui,Arial,sans-serif}"
+                  "table{border-collapse:collapse;width:100%}"
+                  "th,td{border:1px solid #ddd;padding:6px}th{background:#f3f3f3;text-align:left}"
+                  "code{font-family:ui-monospace,Consolas,monospace}</style>"
+                  "</head><body>"
+                   """
                 <style>
                 #specsModal{position:fixed;inset:0;background:rgba(0,0,0,.35);display:none;align-items:center;justify-content:center;z-index:9999}
                 #specsBox{background:#fff;max-width:1000px;width:95%;max-height:85vh;overflow:auto;border-radius:10px;box-shadow:0 10px 30px rgba(0,0,0,.25)}
@@ -846,76 +1175,125 @@ def write_index_html(out_dir: str, rows: List[dict], html_path: str):
                 })();
                 </script>
 
-                """)
-
-        f.write(f"<h1>SPD Catalog</h1><p>Generated {now}</p>")
-        f.write("<table><tr>"
-                "<th>Type</th><th>Vendor</th><th>Part Number</th><th>HP P/N</th><th>Serial</th>"
-                "<th>HPT</th><th>HPT Status</th><th>Computed HPT</th><th>CRC Status</th><th>Stored CRC</th><th>Computed CRC</th>"
-                "<th>File</th><th>View Specs</th></tr>")
-        for r in rows_sorted:
-            vendor = html.escape(r.get("vendor","") or "")
-            pn = html.escape(r.get("part_number","") or "")
-            hp_pn = html.escape(r.get("hp_part_number", ""))
-            serial = f"0x{(r.get('serial_u32') or 0):08X}"
-            hpt = html.escape(r.get("hpt_hex") or "")
-            hpt_status = html.escape(r.get("hpt_status", ""))
-            computed_hpt = f"0x{(r.get('computed_hpt_u32') or 0):08X}" if r.get('computed_hpt_u32') is not None else ""
-            crc_status = r.get("crc_status","")
-
-            # Prefer DDR4 base CRCs; else DDR3/legacy single CRC8
-            stored_crc = r.get("stored_crc_base")
-            computed_crc = r.get("computed_crc_base")
-            if stored_crc is None and computed_crc is None:
-                stored_crc = r.get("stored_crc")
-                computed_crc = r.get("computed_crc")
-
-            def fmt_crc(v: object) -> str:
-                if not isinstance(v, int):
-                    return ""
-                # Heuristic: legacy is 0..255 -> 2 digits; otherwise 4 digits
-                return f"0x{v:02X}" if 0 <= v < 0x100 else f"0x{v:04X}"
-
-            sc = fmt_crc(stored_crc)
-            cc = fmt_crc(computed_crc)
-
-            # Optional: also display extension CRCs if present (SDR/DDR)
-            sc_ext = fmt_crc(r.get("stored_crc_ext"))
-            cc_ext = fmt_crc(r.get("computed_crc_ext"))
-            ext_cell = ""
-            if sc_ext or cc_ext:
-                ext_cell = f"<div>ext: <code>{sc_ext}</code> → <code>{cc_ext}</code></div>"
-
-            rel = os.path.relpath(r.get("dest_path",""), os.path.dirname(html_path)).replace(os.sep, "/")
-            link = html.escape(rel)
-
-            json_rel = ""
-            jp = r.get("json_path")
-            if jp:
-                json_rel = os.path.relpath(jp, os.path.dirname(html_path)).replace(os.sep, "/")
-
-            meta_text = f"{r.get('mem_type','')} · {pn} · {serial}"
-            view_btn = (f"<button class='viewbtn' data-json='{html.escape(json_rel)}' "
-                        f"data-meta='{html.escape(meta_text)}'>View</button>"
-                        if json_rel else "")
-
-            f.write("<tr>"
-                    f"<td>{r.get('mem_type','')}</td>"
-                    f"<td>{vendor}</td>"
-                    f"<td>{pn}</td>"
-                    f"<td>{hp_pn}</td>"
-                    f"<td><code>{serial}</code></td>"
-                    f"<td><code>{hpt}</code></td>"
-                    f"<td>{hpt_status}</td>"
-                    f"<td><code>{computed_hpt}</code></td>"
-                    f"<td>{html.escape(crc_status)}</td>"
-                    f"<td><code>{sc}</code></td>"
-                    f"<td><code>{cc}</code>{ext_cell}</td>"
-                    f"<td><a href='{link}'>{link}</a></td>"
-                    f"<td>{view_btn}</td>"
-                    "</tr>")
-            
-        f.write("</table></body></html>")
+                """).encode("utf-8")
+
+# Vendor / part-number / status strings repeat heavily across catalog rows
+_esc = lru_cache(maxsize=4096)(html.escape)
+
+def _crc8(v) -> str:
+    return "" if v is None else "0x%02X" % v
+
+def _crc16(v) -> str:
+    return "" if v is None else "0x%04X" % v
+
+# DDR3/DDR4 carry CRC-16s; the legacy types carry 8-bit checksums
+_CRC_FMT = {"DDR3": _crc16, "DDR4": _crc16}
+
+_ROW_TEMPLATE = ("<tr>"
+                 "<td>%s</td>"
+                 "<td>%s</td>"
+                 "<td>%s</td>"
+                 "<td>%s</td>"
+                 "<td><code>%s</code></td>"
+                 "<td><code>%s</code></td>"
+                 "<td>%s</td>"
+                 "<td><code>%s</code></td>"
+                 "<td>%s</td>"
+                 "<td><code>%s</code></td>"
+                 "<td><code>%s</code>%s</td>"
+                 "<td><a href='%s'>%s</a></td>"
+                 "<td>%s</td>"
+                 "</tr>")
+
+def index_row(r: dict) -> dict:
+    """
+    Reduce a catalog row to what index.html needs: the sort keys, the paths,
+    and every path-independent cell already formatted and escaped, so the
+    writer only fills _ROW_TEMPLATE.
+    """
+    g = r.get
+    esc = _esc
+    computed_hpt_u32 = g("computed_hpt_u32")
+
+    # Prefer DDR4 base CRCs; else DDR3/legacy single CRC8
+    stored_crc = g("stored_crc_base")
+    computed_crc = g("computed_crc_base")
+    if stored_crc is None and computed_crc is None:
+        stored_crc = g("stored_crc")
+        computed_crc = g("computed_crc")
+
+    fmt_crc = _CRC_FMT.get(r["mem_type"], _crc8)
+
+    # Optional: also display extension CRCs if present (SDR/DDR)
+    sc_ext = fmt_crc(g("stored_crc_ext"))
+    cc_ext = fmt_crc(g("computed_crc_ext"))
+    ext_cell = ""
+    if sc_ext or cc_ext:
+        ext_cell = f"<div>ext: <code>{sc_ext}</code> → <code>{cc_ext}</code></div>"
+
+    return {
+        "mem_type": r["mem_type"],
+        "vendor": r["vendor"],
+        "part_number": r["part_number"],
+        "serial_u32": r["serial_u32"],
+        "dest_path": g("dest_path", ""),
+        "json_path": g("json_path"),
+        "cells": (
+            g("mem_type", ""),
+            esc(g("vendor", "") or ""),
+            esc(g("part_number", "") or ""),
+            esc(g("hp_part_number", "")),
+            _fmt_u32(g("serial_u32") or 0),
+            g("hpt_hex") or "",
+            esc(g("hpt_status", "")),
+            _fmt_u32(computed_hpt_u32) if computed_hpt_u32 is not None else "",
+            esc(g("crc_status", "")),
+            fmt_crc(stored_crc),
+            fmt_crc(computed_crc),
+            ext_cell,
+        ),
+    }
+
+def write_index_html(out_dir: str, rows: List[dict], html_path: str):
+    """rows: index_row() dicts."""
+    rows_sorted = sorted(rows, key=lambda r: (r["mem_type"], r["vendor"], r["part_number"], r["serial_u32"]))
+    now = datetime.now(UTC).strftime("%Y-%m-%d %H:%M UTC")
+    with open(html_path, "wb", buffering=1 << 20) as f:
+        f.write(_INDEX_PREAMBLE)
+
+        f.write((f"<h1>SPD Catalog</h1><p>Generated {now}</p>"
+                 "<table><tr>"
+                 "<th>Type</th><th>Vendor</th><th>Part Number</th><th>HP P/N</th><th>Serial</th>"
+                 "<th>HPT</th><th>HPT Status</th><th>Computed HPT</th><th>CRC Status</th><th>Stored CRC</th><th>Computed CRC</th>"
+                 "<th>File</th><th>View Specs</th></tr>").encode("utf-8"))
+        esc_once = html.escape    # per-row unique paths/labels; not worth caching
+        html_dir = os.path.abspath(os.path.dirname(html_path))
+        prefix = html_dir if html_dir.endswith(os.sep) else html_dir + os.sep
+        cut = len(prefix)
+
+        def rel_url(path: str) -> str:
+            # Catalog paths are absolute and normalized, so anything under the
+            # HTML's directory is a plain prefix trim; relpath only otherwise.
+            rel = path[cut:] if path.startswith(prefix) else os.path.relpath(path, html_dir)
+            return rel.replace(os.sep, "/")
+
+        def row_gen():
+            for r in rows_sorted:
+                cells = r["cells"]
+                link = esc_once(rel_url(r["dest_path"]))
+                view_btn = ""
+                jp = r["json_path"]
+                if jp:
+                    json_rel = rel_url(jp)
+                    if json_rel:
+                        meta_text = f"{cells[0]} · {cells[2]} · {cells[4]}"
+                        view_btn = (f"<button class='viewbtn' data-json='{esc_once(json_rel)}' "
+                                    f"data-meta='{esc_once(meta_text)}'>View</button>")
+                yield (_ROW_TEMPLATE % (*cells, link, link, view_btn)).encode("utf-8")
+
+        # Rows stream into the 1 MiB buffer; no full-document string is built
+        f.writelines(row_gen())
+        f.write(b"</table></body></html>")
 
 
 # ---------------------- Main flow -------------------------
@@ -938,40 +1316,85 @@ def main():
     ap.add_argument("--spd-tool-args", default="", 
                 help='Extra args for spd_tool.py dump (e.g. "--programmer")')
     ap.add_argument("--hpt-registry", default="hp_families.json", help="Path to HP families JSON registry")
+    ap.add_argument("--bulk-import", action="store_true",
+                    help="Stage rows in an in-memory DB and copy them to --db in one pass (large first ingests)")
+    ap.add_argument("--no-scan-cache", action="store_true",
+                    help="Rescan every file even if its size/mtime match the DB scan cache")
+    ap.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                    help="Worker processes for scanning (default: CPU count; 1 disables the pool; "
+                         "small scans always run serially)")
     args = ap.parse_args()
 
     out_root = os.path.abspath(args.out_root)
     os.makedirs(out_root, exist_ok=True)
-    conn = db_connect(args.db)
+    # In bulk mode the secondary indexes are built after the load, not per row
+    conn = db_connect(args.db, indexes=not args.bulk_import)
     db_migrate(conn)
 
     hp_registry = load_registry(args.hpt_registry) or {}
     hp_rev = _build_reverse_map(hp_registry)
+    hp_fams = _build_hpt_families(hp_registry)
+    hp_params = _build_hpt_params(hp_fams)
     # Create a reverse map from vendor P/N to HP P/N info
 
 
-    all_paths = list(walk_paths(args.path, args.recursive))
+    entries = list(walk_paths(args.path, args.recursive))
+    all_paths = [e.path for e in entries]
     added_rows = []
+    db_rows = []  # _row_to_tuple() of added_rows, written in one batch
     processed_files = set()
 
-    for p in all_paths:
-        matches = scan_file_for_spd(p, args.step)
+    # Scan cache: a file whose (size, mtime_ns) and --step match a previous
+    # run only has its known SPD windows re-parsed (or is skipped outright
+    # if it held none).
+    cache = {} if args.no_scan_cache else scan_cache_load(conn)
+    file_stats, known = {}, []
+    for p, e in zip(all_paths, entries):
+        ap_ = os.path.abspath(p)
+        try:
+            st = e.stat()
+            file_stats[p] = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            known.append(None)
+            continue
+        ent = cache.get(ap_)
+        if st.st_size < 128:
+            known.append(([], None))  # too small for any SPD; never opened
+        elif ent and (ent[0], ent[1], ent[2]) == (st.st_size, st.st_mtime_ns, args.step):
+            known.append((json.loads(ent[4]), ent[3]))
+        else:
+            known.append(None)
+    cache_entries = []
+    pending_json = {}  # json_path -> [due spd path, later fallbacks]; dumped after the scan loop
+    json_mtimes = {}   # json_path -> sidecar mtime as the inline dumps would have left it
+    # One query up front instead of a lookup per matched block
+    existing_hashes = {r[0] for r in conn.execute("SELECT spd_sha256 FROM spd")}
+
+    # Cache hits and tiny files are cheap; only bytes left to scan justify workers
+    scan_bytes = sum(file_stats[p][0] for p, k in zip(all_paths, known) if k is None and p in file_stats)
+    scan_jobs = args.jobs if scan_bytes >= SCAN_POOL_MIN_BYTES else 1
+
+    for p, file_hash, matches in scan_files(all_paths, args.step, scan_jobs, known):
         if matches:
             processed_files.add(os.path.abspath(p))  # mark as having at least one SPD
-        if not matches:
-            continue
-
-        
 
         move_original = (args.move_single and len(matches) == 1)
-        src_hash = file_sha256(p) if move_original else None
+        src_hash = file_hash if move_original else None
+
+        if p in file_stats and not move_original:
+            size, mtime_ns = file_stats[p]
+            hits = json.dumps([[m["file_offset"], m["spd_size"]] for m in matches])
+            cache_entries.append((os.path.abspath(p), size, mtime_ns, args.step,
+                                  file_hash, hits, int(time.time())))
+        if not matches:
+            continue
 
         for idx, m in enumerate(matches):
             block = m.pop("raw")
             spd_hash = sha256_hex(block)
-            # Optional: skip heavy rewrites if already in DB
-            cur = conn.execute("SELECT 1 FROM spd WHERE spd_sha256=? LIMIT 1", (spd_hash,))
-            already = cur.fetchone() is not None
+            # Optional: skip heavy rewrites if already in DB (or seen this run)
+            already = spd_hash in existing_hashes
+            existing_hashes.add(spd_hash)
 
             mem_type = m.get("mem_type")
             vendor = m.get("mfg_id_str")
@@ -979,7 +1402,7 @@ def main():
             pn = pn_raw.strip()
             pn_key = _norm_pn(pn)
             serial_u32 = m.get('serial_u32', 0)
-            serial_hex = f"0x{serial_u32:08X}"
+            serial_hex = _fmt_u32(serial_u32)
             hpt_u32 = m.get("hpt_code_u32")
             hpt_hex = m.get("hpt_code_hex","")
 
@@ -994,13 +1417,18 @@ def main():
                     vendor_pn=pn,
                     serial_u32=serial_u32,
                     hpt_u32=hpt_u32,
-                    reg=hp_registry,
+                    fams=hp_fams,
                     rev=hp_rev
                 )
 
             if fam:
                 hp_pn = fam.get("name", "") or ""
-                solutions = compute_hpt_solutions(serial_u32, fam)
+                params = hp_params.get(hp_key)
+                if params:
+                    A, B, K, invB = params
+                    solutions = [u32((K - A * serial_u32) * invB)]
+                else:
+                    solutions = compute_hpt_solutions(serial_u32, fam)
                 
                 if not solutions:
                     hpt_status = "inconsistent_data"
@@ -1020,29 +1448,34 @@ def main():
                 src_ext = os.path.splitext(p)[1].lstrip(".") or "bin"
                 rel = dest_rel_path(mem_type, vendor, pn, serial_hex, hpt_hex, src_ext)
                 dest = os.path.join(out_root, rel)
-                if not os.path.exists(dest):
-                    ensure_dir(dest)
-                    base, ext = os.path.splitext(dest)
-                    n = 1
-                    while os.path.exists(dest):
-                        dest = f"{base}__dup{n}{ext}"; n += 1
-                    shutil.move(p, dest)
+                ensure_dir(dest)
+                placeholder = open_new(dest)
+                if placeholder is not None:
+                    # Claimed the name; the move replaces the empty placeholder
+                    placeholder.close()
+                    try:
+                        shutil.move(p, dest)
+                    except BaseException:
+                        os.unlink(dest)
+                        raise
                 src_path = p
                 dest_path = dest
             else:
                 rel = dest_rel_path(mem_type, vendor, pn, serial_hex, hpt_hex, "spd.bin")
                 dest = os.path.join(out_root, rel)
                 ensure_dir(dest)
-                if not os.path.exists(dest):
-                    with open(dest, "wb") as f:
+                f = open_new(dest)
+                if f is not None:
+                    with f:
                         f.write(block)
                 src_path = p
                 dest_path = dest
 
             json_path = json_sibling_path(dest_path)
-            ensure_spd_json(args.spd_tool, dest_path, json_path,
-                            extra_args=args.spd_tool_args, verbose=args.verbose)
-
+            if sidecar_due(json_mtimes, json_path, dest_path):
+                pending_json[json_path] = [dest_path]
+            elif json_path in pending_json:
+                pending_json[json_path].append(dest_path)  # retried only if the due dump fails
 
             # CRC columns (DDR3/DDR4 variants)
             stored_crc = m.get("stored_crc")
@@ -1080,47 +1513,37 @@ def main():
                 "json_path": os.path.abspath(json_path),
                 "spd_sha256": spd_hash,
             }
-            db_upsert(conn, row)
             added_rows.append(row)
+            db_rows.append(_row_to_tuple(row))
 
-    conn.commit()
+    ensure_spd_jsons(args.spd_tool, pending_json, extra_args=args.spd_tool_args,
+                     verbose=args.verbose, jobs=args.jobs)
+
+    # All rows go in as one batch (optionally staged in memory first)
+    if args.bulk_import:
+        db_bulk_import(args.db, db_rows)
+        db_create_indexes(conn)
+    else:
+        db_upsert_many(conn, db_rows)
+    scan_cache_store(conn, cache_entries)
     conn.close()
 
     all_paths_abs = {os.path.abspath(p) for p in all_paths}
     files_no_spd = sorted(all_paths_abs - processed_files)
 
-    # De-duplicate rows for HTML by SPD content (sha256)
-    unique_rows, _seen = [], set()
+    # De-duplicate rows for HTML by SPD content (sha256); the first row wins
+    first_rows = {}
     for r in added_rows:
         sig = r.get("spd_sha256")
-        if not sig or sig in _seen:
-            continue
-        _seen.add(sig)
-        unique_rows.append({
-            "mem_type": r["mem_type"],
-            "vendor": r["vendor"],
-            "part_number": r["part_number"],
-            "hp_part_number": r.get("hp_part_number"),
-            "serial_u32": r["serial_u32"],
-            "hpt_hex": r["hpt_hex"],
-            "hpt_status": r["hpt_status"],
-            "computed_hpt_u32": r.get("computed_hpt_u32"),
-            "crc_status": r["crc_status"],
-            "stored_crc": r.get("stored_crc"),
-            "computed_crc": r.get("computed_crc"),
-            "stored_crc_base": r.get("stored_crc_base"),
-            "computed_crc_base": r.get("computed_crc_base"),
-            "stored_crc_ext": r.get("stored_crc_ext"),
-            "computed_crc_ext": r.get("computed_crc_ext"),
-            "dest_path": r["dest_path"],
-            "json_path": r.get("json_path"),
-        })
+        if sig:
+            first_rows.setdefault(sig, r)
+    unique_rows = [index_row(r) for r in first_rows.values()]
 
     if args.html:
         write_index_html(out_root, unique_rows, args.html)
 
     print(f"\nProcessed {len(all_paths)} file(s).")
-    print(f"Indexed {len(_seen)} unique SPD block(s).")
+    print(f"Indexed {len(unique_rows)} unique SPD block(s).")
     if files_no_spd:
         print("Files with no SPD found:")
         for f in files_no_spd:
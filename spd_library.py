@@ -4,6 +4,7 @@
 # spd_library.py
 #
 import re
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 
 from sdr_decoder import SDRDecoder
@@ -40,8 +41,8 @@ class SPD:
 
         # Choose decoder. If mem_type looks unknown but the image is 128B,
         # attempt SDR as a heuristic—some very old dumps have byte2==0x00.
-        self.decoder = self._get_decoder_with_fallback()
-        self.decoded_data = self.decoder.decode()
+        # Identical images (common in bulk dumps) share one decode.
+        self.decoder, self.decoded_data = _decode_cached(bytes(self.data))
 
     def _mem_type_label(self, v: int) -> str:
         return {
@@ -50,32 +51,39 @@ class SPD:
             MEM_DDR3: "DDR3",
         }.get(v, f"Unknown(0x{v:02X})")
 
-    def _get_decoder_with_fallback(self):
-        """Select the proper decoder based on SPD Byte 2, with a safe SDR fallback for 128B dumps."""
-        if self.mem_type == MEM_SDR:
-            return SDRDecoder(self.data)
-        if self.mem_type == MEM_DDR3:
-            return DDR3Decoder(self.data)
-
-        # Heuristic fallback: legacy 128B images are almost always SDR/DDR era.
-        # Try SDR first; if it explodes, re-raise NotImplemented below.
-        if len(self.data) == 128:
-            try:
-                return SDRDecoder(self.data)
-            except Exception:
-                pass
-
-        raise NotImplementedError(
-            f"Memory type 0x{self.mem_type:02X} not supported yet "
-            f"(len={len(self.data)})."
-        )
-
     def get_decoded_data(self) -> Dict:
         return self.decoded_data
 
     def patch(self, source_spd: 'SPD', args) -> bytes:
         return self.decoder.patch(source_spd.data, args)
 
+def _get_decoder_with_fallback(data: bytes):
+    """Select the proper decoder based on SPD Byte 2, with a safe SDR fallback for 128B dumps."""
+    mem_type = data[2]
+    if mem_type == MEM_SDR:
+        return SDRDecoder(data)
+    if mem_type == MEM_DDR3:
+        return DDR3Decoder(data)
+
+    # Heuristic fallback: legacy 128B images are almost always SDR/DDR era.
+    # Try SDR first; if it explodes, re-raise NotImplemented below.
+    if len(data) == 128:
+        try:
+            return SDRDecoder(data)
+        except Exception:
+            pass
+
+    raise NotImplementedError(
+        f"Memory type 0x{mem_type:02X} not supported yet "
+        f"(len={len(data)})."
+    )
+
+@lru_cache(maxsize=256)
+def _decode_cached(data: bytes):
+    """(decoder, decoded_data) for an SPD image; callers must not mutate the dict."""
+    decoder = _get_decoder_with_fallback(data)
+    return decoder, decoder.decode()
+
 def _try_load_text_hex(raw: bytes) -> Optional[bytes]:
     """
     Accepts text with hex tokens and returns bytes if >=128 bytes found.
@@ -88,14 +96,13 @@ def _try_load_text_hex(raw: bytes) -> Optional[bytes]:
     except Exception:
         return None
 
-    vals: List[int] = []
-    for m in _TEXT_HEX_RE.finditer(txt):
-        vals.append(int(m.group(1), 16))
+    # Collect the digit pairs and convert them in one C call
+    vals = bytes.fromhex("".join(_TEXT_HEX_RE.findall(txt)))
 
     if len(vals) >= 256:
-        return bytes(vals[:256])
+        return vals[:256]
     if len(vals) >= 128:
-        return bytes(vals[:128])
+        return vals[:128]
     return None
 
 def load_spd_file(path: str) -> SPD:
@@ -119,6 +126,8 @@ def load_spd_file(path: str) -> SPD:
 
     raise ValueError(f"{path}: Not a valid SPD image (need ≥128 bytes in binary or text-hex).")
 
+_DIFF_CHUNK = 32
+
 def hexdiff(a: bytes, b: bytes) -> List[Tuple[int, Optional[int], Optional[int]]]:
     """
     Compare two byte strings and return a list of (offset, a_byte, b_byte) for all differing positions.
@@ -126,10 +135,17 @@ def hexdiff(a: bytes, b: bytes) -> List[Tuple[int, Optional[int], Optional[int]]
     """
     diffs: List[Tuple[int, Optional[int], Optional[int]]] = []
     la, lb = len(a), len(b)
-    L = max(la, lb)
-    for i in range(L):
-        av = a[i] if i < la else None
-        bv = b[i] if i < lb else None
-        if av != bv:
-            diffs.append((i, av, bv))
+    n = min(la, lb)
+    # Compare the common part in 32-byte chunks (a C-level memcmp each) and
+    # only walk bytes inside chunks that actually differ.
+    for base in range(0, n, _DIFF_CHUNK):
+        end = min(base + _DIFF_CHUNK, n)
+        ca, cb = a[base:end], b[base:end]
+        if ca != cb:
+            diffs.extend((i, av, bv) for i, av, bv in zip(range(base, end), ca, cb) if av != bv)
+    # Tail of the longer input has no counterpart
+    if la > lb:
+        diffs.extend((i, a[i], None) for i in range(n, la))
+    elif lb > la:
+        diffs.extend((i, None, b[i]) for i in range(n, lb))
     return diffs
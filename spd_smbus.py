@@ -21,12 +21,13 @@ python spd_smbus.py write --bus 1 --addr 0x50 --in new.bin --fix-crc --verify
 # Hex dump (and quick decode of a few fields)
 python spd_smbus.py dump --bus 1 --addr 0x50
 """
-import argparse, ctypes as C, fcntl, glob, os, sys, time
+import argparse, binascii, ctypes as C, fcntl, glob, os, sys, time
 from typing import List, Tuple
 
 # ---- ioctl constants from linux/i2c-dev.h
 I2C_RDWR  = 0x0707
 I2C_M_RD  = 0x0001
+I2C_RDWR_IOCTL_MAX_MSGS = 42
 
 # ---- i2c_msg and i2c_rdwr structs
 class i2c_msg(C.Structure):
@@ -45,82 +46,107 @@ class i2c_rdwr_ioctl_data(C.Structure):
 
 def _i2c_rdwr(fd, msgs: List[Tuple[int,int,bytearray]]) -> None:
     """
-    msgs: list of (addr, flags, buffer) where buffer is a bytearray (writable for reads)
+    msgs: list of (addr, flags, buffer) where buffer is bytes-like (a writable
+    bytearray or memoryview for reads)
     """
-    # Build C array of i2c_msg, keeping Python buffers alive in a side list
+    # Build C array of i2c_msg, keeping Python buffers alive in a side list.
+    # Each msg points straight at its bytearray: the kernel reads write
+    # buffers and fills read buffers in place, so nothing is copied.
     c_msgs = (i2c_msg * len(msgs))()
     keepalive = []
     for i, (addr, flags, buf) in enumerate(msgs):
-        if not isinstance(buf, (bytes, bytearray)):
-            raise TypeError("buffer must be bytes/bytearray")
-        ba = bytearray(buf) if not isinstance(buf, bytearray) else buf
-        keepalive.append(ba)
-        c_buf = C.create_string_buffer(len(ba))  # always alloc; copy for writes
-        if not (flags & I2C_M_RD) and len(ba):
-            C.memmove(c_buf, (C.c_char * len(ba)).from_buffer(ba), len(ba))
+        if not isinstance(buf, (bytes, bytearray, memoryview)):
+            raise TypeError("buffer must be bytes/bytearray/memoryview")
+        writable = isinstance(buf, bytearray) or (isinstance(buf, memoryview) and not buf.readonly)
+        if flags & I2C_M_RD and not writable:
+            raise TypeError("read buffer must be a bytearray or writable memoryview")
+        ba = buf if writable else bytearray(buf)
+        c_buf = (C.c_ubyte * len(ba)).from_buffer(ba)
+        keepalive.append(c_buf)
         c_msgs[i].addr  = addr
         c_msgs[i].flags = flags
         c_msgs[i].len   = len(ba)
-        c_msgs[i].buf   = C.cast(c_buf, C.c_void_p)
-        keepalive.append(c_buf)
+        c_msgs[i].buf   = C.addressof(c_buf)
     data = i2c_rdwr_ioctl_data(C.cast(c_msgs, C.POINTER(i2c_msg)), len(msgs))
     fcntl.ioctl(fd, I2C_RDWR, data)
-    # copy read data back
-    for i, (addr, flags, buf) in enumerate(msgs):
-        if flags & I2C_M_RD:
-            src = C.cast(c_msgs[i].buf, C.POINTER(C.c_ubyte))
-            for j in range(c_msgs[i].len):
-                buf[j] = src[j]
 
 # ---- SPD helpers
 def crc16_xmodem(data: bytes) -> int:
     """JEDEC base CRC for DDR3 SPD: poly 0x1021, init 0x0000, no reflect, xorout 0x0000"""
-    reg = 0x0000
-    for b in data:
-        reg ^= (b << 8) & 0xFFFF
-        for _ in range(8):
-            if reg & 0x8000:
-                reg = ((reg << 1) ^ 0x1021) & 0xFFFF
-            else:
-                reg = (reg << 1) & 0xFFFF
-    return reg & 0xFFFF
+    # binascii.crc_hqx is exactly this CRC (CRC-16/XMODEM), computed in C
+    return binascii.crc_hqx(data, 0)
 
 def fix_base_crc(spd: bytearray) -> None:
     if len(spd) < 128:
         return
-    crc = crc16_xmodem(bytes(spd[0:117]))  # 0..116 inclusive
+    crc = crc16_xmodem(memoryview(spd)[0:117])  # 0..116 inclusive, no copy
     spd[126] = crc & 0xFF
     spd[127] = (crc >> 8) & 0xFF
 
+# printable ASCII stays, everything else becomes '.'
+_ASC = bytes(i if 32 <= i < 127 else 0x2E for i in range(256))
+
 def hexdump(b: bytes, width: int = 16) -> str:
+    # bytes.hex()/translate() format a whole row in C instead of per byte
+    b = bytes(b)
     lines=[]
     for off in range(0, len(b), width):
         chunk = b[off:off+width]
-        hexs = " ".join(f"{x:02X}" for x in chunk)
-        asc  = "".join(chr(x) if 32<=x<127 else "." for x in chunk)
+        hexs = chunk.hex(" ").upper()
+        asc  = chunk.translate(_ASC).decode("ascii")
         lines.append(f"{off:03d}: {hexs:<{width*3}}  {asc}")
     return "\n".join(lines)
 
 # ---- low-level SPD ops
-def spd_read(fd: int, addr: int, start: int=0, end: int=255, chunk: int=16) -> bytes:
+def spd_read(fd: int, addr: int, start: int=0, end: int=255, chunk: int=32) -> bytearray:
     if not (0x03 <= chunk <= 32):  # keep messages short; many EEPROMs like 16/32B
-        chunk = 16
-    out = bytearray()
+        chunk = 32
+    # The kernel reads every chunk straight into its slot of one final buffer
+    out = bytearray(max(0, end - start + 1))
+    view = memoryview(out)
+    # SMBus random-read per chunk: write [offset] then repeated-start read n bytes
+    pairs = []
     for ofs in range(start, end+1, chunk):
         n = min(chunk, end - ofs + 1)
-        # SMBus random-read: write [offset] then repeated-start read n bytes
-        wbuf = bytearray([ofs & 0xFF])
-        rbuf = bytearray(n)
-        _i2c_rdwr(fd, [
-            (addr, 0x0000, wbuf),
-            (addr, I2C_M_RD, rbuf),
-        ])
-        out += rbuf
-    return bytes(out)
+        pos = ofs - start
+        pairs.append(((addr, 0x0000, bytearray([ofs & 0xFF])), (addr, I2C_M_RD, view[pos:pos+n])))
+    # Send as many pairs per ioctl as the kernel accepts (256B at 32B = 1 call)
+    per_call = I2C_RDWR_IOCTL_MAX_MSGS // 2
+    for i in range(0, len(pairs), per_call):
+        batch = pairs[i:i+per_call]
+        try:
+            _i2c_rdwr(fd, [msg for pair in batch for msg in pair])
+        except OSError:
+            if len(batch) == 1:
+                raise
+            # some adapters cap messages per transfer; go one pair at a time
+            for pair in batch:
+                _i2c_rdwr(fd, list(pair))
+    return out
+
+def _wait_write_cycle(fd: int, addr: int, t_wr_s: float) -> None:
+    """
+    ACK polling: the EEPROM NACKs while its internal write cycle runs, so
+    probe it every ~200us and return on the first ACK. t_wr_s stays the
+    ceiling; a device that never ACKs just costs the full fixed delay.
+    """
+    deadline = time.monotonic() + t_wr_s
+    while True:
+        try:
+            quick_read_byte0(fd, addr)
+            return
+        except OSError:
+            if time.monotonic() >= deadline:
+                return
+            time.sleep(0.0002)
 
 def spd_write(fd: int, addr: int, data: bytes, start: int=0, end: int=255,
-              page_size: int=16, t_wr_s: float=0.02, verify: bool=True) -> None:
-    """Page-write with delay and optional verify. Most DDR3 SPD EEPROMs are 16B pages."""
+              page_size: int=16, t_wr_s: float=0.02, verify: bool=True,
+              poll: bool=False) -> None:
+    """
+    Page-write with delay and optional verify. Most DDR3 SPD EEPROMs are 16B pages.
+    poll: wait for each page by ACK polling instead of sleeping the full t_wr_s.
+    """
     if page_size not in (8, 16, 32, 64):
         page_size = 16
     start = max(0, start); end = min(255, end)
@@ -134,16 +160,18 @@ def spd_write(fd: int, addr: int, data: bytes, start: int=0, end: int=255,
         wbuf[0] = pos & 0xFF
         wbuf[1:] = view[pos:pos+n]
         _i2c_rdwr(fd, [(addr, 0x0000, wbuf)])
-        time.sleep(t_wr_s)  # write cycle time
+        if poll:
+            _wait_write_cycle(fd, addr, t_wr_s)
+        else:
+            time.sleep(t_wr_s)  # write cycle time
         pos += n
     if verify:
         rb = spd_read(fd, addr, start, end)
-        if rb != bytes(view[start:end+1]):
+        want = view[start:end+1]
+        if memoryview(rb) != want:  # compares in place, no copy of the image
             # find first mismatch
-            for i, (a,b) in enumerate(zip(rb, view[start:end+1])):
-                if a != b:
-                    off = start + i
-                    raise IOError(f"verify failed at {off} (wrote {b:02X}, read {a:02X})")
+            i, a, b = next((i, a, b) for i, (a, b) in enumerate(zip(rb, want)) if a != b)
+            raise IOError(f"verify failed at {start + i} (wrote {b:02X}, read {a:02X})")
     return
 
 # ---- bus helpers
@@ -182,10 +210,16 @@ def ee1004_present(bus: int, addr: int) -> bool:
         # some kernels still provide eeprom without a name; treat existence of file as present
         return os.path.exists(os.path.join(ee1004_devpath(bus, addr), "eeprom"))
 
+EE1004_READ_MAX = 4096  # ee1004 is 512B; leaves room for larger parts
+
 def ee1004_read(bus: int, addr: int) -> bytes:
     path = os.path.join(ee1004_devpath(bus, addr), "eeprom")
-    with open(path, "rb") as f:
-        blob = f.read()
+    # One pread syscall; no file object or buffered-IO layer per read
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        blob = os.pread(fd, EE1004_READ_MAX, 0)
+    finally:
+        os.close(fd)
     # Most drivers expose a 512-byte eeprom. If shorter, still return what we got.
     return blob
 
@@ -273,9 +307,14 @@ def cmd_dump(args):
     finally:
         os.close(fd)
     print(hexdump(data))
-    tag = data[176:180]; code = data[180:184]
-    print(f"\nHPT tag: {'present' if tag==b'HPT\\x00' else 'absent'}"
-          + (f', code={code.hex().upper()}' if tag==b'HPT\\x00' else ""))
+    # Same marker search as the ee1004 path (DDR3 parts carry it at 176..183)
+    hits = _search_hpt(data)
+    if hits:
+        code = hits[0][1]
+        pretty = code.hex().upper() if len(code)==4 else "(truncated)"
+        print(f"\nHPT tag: present, code={pretty}")
+    else:
+        print("\nHPT tag: absent")
 
 def cmd_dump_ee1004(args):
     # DDR4/sysfs
@@ -307,7 +346,8 @@ def cmd_write(args):
     start,end = args.range
     fd = open_bus(args.bus)
     try:
-        spd_write(fd, args.addr, img, start, end, page_size=args.page, t_wr_s=args.delay, verify=args.verify)
+        spd_write(fd, args.addr, img, start, end, page_size=args.page, t_wr_s=args.delay,
+                  verify=args.verify, poll=args.poll)
     finally:
         os.close(fd)
     print(f"Wrote {end-start+1} bytes to 0x{args.addr:02X} on bus {args.bus}")
@@ -333,7 +373,7 @@ def main(argv=None):
     p.add_argument("--addr", required=True, type=lambda x:int(x,0))
     p.add_argument("--start", type=lambda x:int(x,0), default=0)
     p.add_argument("--end",   type=lambda x:int(x,0), default=255)
-    p.add_argument("--chunk", type=int, default=16)
+    p.add_argument("--chunk", type=int, default=32)
     p.add_argument("--out")
     p.add_argument("--ee1004", action="store_true", help="force ee1004 sysfs path (DDR4)")
     p.add_argument("--auto", action="store_true", help="prefer ee1004 if available at bus/addr")
@@ -342,7 +382,7 @@ def main(argv=None):
     p = sub.add_parser("dump", help="hexdump (DDR3/raw i2c-dev)")
     p.add_argument("--bus", required=True, type=int)
     p.add_argument("--addr", required=True, type=lambda x:int(x,0))
-    p.add_argument("--chunk", type=int, default=16)
+    p.add_argument("--chunk", type=int, default=32)
     p.set_defaults(func=cmd_dump)
 
     p = sub.add_parser("dump-ee1004", help="hexdump (DDR4/ee1004 sysfs), searches HPT markers")
@@ -357,12 +397,14 @@ def main(argv=None):
     p.add_argument("--range", type=_parse_range, default=(0,255), help="byte range a:b (inclusive)")
     p.add_argument("--page", type=int, default=16, help="EEPROM page size (8/16/32/64)")
     p.add_argument("--delay", type=float, default=0.02, help="write cycle delay seconds (t_WR)")
+    p.add_argument("--poll", action="store_true", help="ACK-poll after each page (--delay becomes the timeout)")
     p.add_argument("--verify", action="store_true", help="read-back verify")
     p.add_argument("--fix-crc", action="store_true", help="fix base CRC16 (bytes 126..127)")
     p.add_argument("--ee1004", action="store_true", help="(guard) not supported for write")
     p.set_defaults(func=cmd_write)
 
-    try: return ap.parse_args(argv).__dict__['func'](ap.parse_args(argv))
+    ns = ap.parse_args(argv)
+    try: return ns.func(ns)
     except PermissionError:
         print("Permission denied. Run as root or relax udev on /dev/i2c-* and sysfs eeprom.", file=sys.stderr)
         return 1
@@ -21,6 +21,10 @@ def _json_default(o):
     # Add other special cases if your decoded_data can include them
     raise TypeError(f"Object of type {o.__class__.__name__} is not JSON serializable")
 
+def dump_to_dict(spd_path: str) -> dict:
+    """Decode an SPD file and return what 'dump --json' would serialize."""
+    return load_spd_file(spd_path).get_decoded_data()
+
 def cmd_dump(args: argparse.Namespace):
     """Handles the 'dump' command."""
     spd = load_spd_file(args.spd)
@@ -118,17 +122,18 @@ def main():
     p = subparsers.add_parser("smbus", help="SMBus/I2C SPD ops (scan/read/write)")
     p.add_argument("args", nargs=argparse.REMAINDER, help="pass-through to spd_smbus.py")
     def _smbus_cmd(ns):
-    # forward args to the expansion tool's argparse
-        sys.exit(smbus_main(ns.args))
+        # forward the already-split REMAINDER to spd_smbus's parser (parsed once there)
+        return smbus_main(ns.args)
     p.set_defaults(func=_smbus_cmd)
 
 
     args = parser.parse_args()
     try:
-        args.func(args)
+        rc = args.func(args)
     except (ValueError, FileNotFoundError, SystemExit, NotImplementedError) as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
+    sys.exit(rc)
 
 if __name__ == "__main__":
     main()
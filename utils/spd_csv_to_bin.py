@@ -19,10 +19,11 @@ Usage:
 """
 from __future__ import annotations
 import argparse
+import binascii
 import csv
 import re
 import sys
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Iterable, List, Optional, Tuple
 
 HEX_PAIR_RE = re.compile(r"^[0-9A-Fa-f]{2}$")
 ONLY_HEX_RE = re.compile(r"^[0-9A-Fa-f]+$")
@@ -75,10 +76,7 @@ def normalize_hex_run(s: str) -> Optional[bytes]:
         return None
     if not ONLY_HEX_RE.match(t):
         return None
-    try:
-        return bytes(int(t[i:i+2], 16) for i in range(0, len(t), 2))
-    except Exception:
-        return None
+    return bytes.fromhex(t)
 
 
 def parse_value_byte(token: str) -> Optional[int]:
@@ -163,8 +161,7 @@ def read_csv_records(path: str) -> List[Tuple[str, str]]:
 
 
 def build_buffer(records: List[Tuple[str, str]], total_len: int, encoding: str) -> bytearray:
-    buf = bytearray([0x00] * total_len)
-    written: Dict[int, int] = {}
+    buf = bytearray(total_len)
 
     for idx_str, val_str in records:
         start, end = parse_index_or_range(idx_str)
@@ -183,7 +180,6 @@ def build_buffer(records: List[Tuple[str, str]], total_len: int, encoding: str)
             if start >= total_len:
                 raise SystemExit(f"Index {start} is outside output length {total_len}")
             buf[start] = b
-            written[start] = b
             continue
 
         # range path: half‑open [start, end)
@@ -204,24 +200,14 @@ def build_buffer(records: List[Tuple[str, str]], total_len: int, encoding: str)
         if end > total_len:
             raise SystemExit(
                 f"Range {start}-{end} exceeds output length {total_len} (max index {total_len-1})")
-        # write
-        for off, byte in enumerate(data):
-            i = start + off
-            buf[i] = byte
-            written[i] = byte
+        # write (length and bounds checked above, so this never resizes buf)
+        buf[start:end] = data
     return buf
 
 
 def crc16_ccitt(data: bytes, init: int = 0x0000) -> int:
-    crc = init & 0xFFFF
-    for b in data:
-        crc ^= (b & 0xFF) << 8
-        for _ in range(8):
-            if crc & 0x8000:
-                crc = ((crc << 1) ^ 0x1021) & 0xFFFF
-            else:
-                crc = (crc << 1) & 0xFFFF
-    return crc
+    # Poly 0x1021, MSB-first, no xorout: binascii.crc_hqx computes it in C
+    return binascii.crc_hqx(data, init & 0xFFFF)
 
 
 def main() -> None:
@@ -17,29 +17,93 @@ Usage:
   python spd_text_to_bin.py -i "Samsung*.txt" -o out_dir/
   python spd_text_to_bin.py -i "dump.txt" -o dump.bin
 """
-import argparse, glob, os, re, sys
+import argparse, binascii, fnmatch, glob, os, sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 
-HEX2 = re.compile(r"^[0-9A-Fa-f]{2}$")
-OFFSET = re.compile(r"^[0-9A-Fa-f]{3,4}$")  # e.g. 000, 010, 0A0, 00A0
+# A worker costs milliseconds to start while a dump converts in ~0.1 ms, so
+# smaller batches finish sooner in-process
+POOL_MIN_INPUTS = 256
+
+_HEXDIGITS = "0123456789abcdefABCDEF"
+# Every 2-hex-digit token in any letter case. Offsets (3-4 digits) and
+# other junk are simply not members, so one set lookup validates a token.
+HEX_PAIRS = frozenset(h + l for h in _HEXDIGITS for l in _HEXDIGITS)
+HEX_PAIRS_B = frozenset(p.encode("ascii") for p in HEX_PAIRS)
+# str.split() also breaks on the ASCII separators 0x1C..0x1F; bytes.split() does not
+_ASCII_SEPS = bytes.maketrans(b"\x1c\x1d\x1e\x1f", b"    ")
 
 def parse_text_spd(path: Path) -> bytes:
-    out = bytearray()
-    with path.open("r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            # Split on whitespace; skip empty lines
-            parts = line.strip().split()
-            if not parts:
-                continue
-            # If the first token looks like an address/offset, drop it
-            if OFFSET.match(parts[0]):
-                parts = parts[1:]
-            # Collect any 2-hex-digit tokens
-            for tok in parts:
-                if HEX2.match(tok):
-                    out.append(int(tok, 16))
-                # else ignore non-hex tokens silently
-    return bytes(out)
+    # Lines only separate tokens, so split the whole file once, then decode
+    # every kept token in a single C call
+    raw = path.read_bytes()
+    if raw.isascii():
+        # Plain-ASCII dumps (the norm) skip the text codec entirely
+        pairs = HEX_PAIRS_B
+        return binascii.unhexlify(b"".join([tok for tok in raw.translate(_ASCII_SEPS).split()
+                                            if tok in pairs]))
+    text = raw.decode("utf-8", errors="ignore")
+    pairs = HEX_PAIRS
+    return bytes.fromhex("".join([tok for tok in text.split() if tok in pairs]))
+
+def write_file(path, data: bytes):
+    """Create/truncate `path` and write `data` with raw fd calls (no buffered writer)."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+def expand_inputs(pattern: str) -> list:
+    """Sorted paths matching `pattern`, with glob.glob semantics.
+
+    The common "dir/*.txt" form is matched with a single os.scandir pass
+    instead of glob's per-entry work; wildcards in the directory part still
+    go through glob.
+    """
+    dirname, name = os.path.split(pattern)
+    if glob.has_magic(dirname):
+        return sorted(glob.glob(pattern))
+    if not glob.has_magic(name):
+        return [pattern] if os.path.lexists(pattern) else []
+    hidden_ok = name.startswith(".")  # glob skips dot-files unless asked for
+    try:
+        with os.scandir(dirname or os.curdir) as it:
+            names = [e.name for e in it
+                     if (hidden_ok or e.name[0] != ".") and fnmatch.fnmatch(e.name, name)]
+    except OSError:
+        return []
+    return sorted(os.path.join(dirname, n) for n in names)
+
+def _bin_name(inp: str) -> str:
+    return os.path.splitext(os.path.basename(inp))[0] + ".bin"
+
+def _convert(inp: str, out_dir: str):
+    """Batch worker: parse one dump and write <out_dir>/<stem>.bin -> (inp, dst, nbytes)."""
+    data = parse_text_spd(Path(inp))
+    dst = os.path.join(out_dir, _bin_name(inp))
+    write_file(dst, data)
+    return inp, dst, len(data)
+
+def _try_convert(inp: str, out_dir: str):
+    """Pool worker: _convert, but a failure comes back as the result so the
+    inputs before it in the same map chunk are still reported."""
+    try:
+        return _convert(inp, out_dir)
+    except Exception as e:
+        return inp, None, e
+
+def _report(results, expect_len: int, msgs: list):
+    """Append the WARN/OK lines for each (inp, dst, nbytes) as it arrives."""
+    for inp, dst, n in results:
+        if isinstance(n, Exception):
+            raise n
+        if expect_len and n != expect_len:
+            msgs.append(f"[WARN] {inp}: got {n} bytes (expected {expect_len}); writing anyway.")
+        msgs.append(f"[OK] {inp} → {dst}  ({n} bytes)")
 
 def main():
     ap = argparse.ArgumentParser(description="Convert text SPD hex dump(s) to binary")
@@ -49,9 +113,11 @@ def main():
                     help="Output file (.bin) OR existing directory for batch")
     ap.add_argument("--expect-len", type=int, default=0,
                     help="Optional expected byte length (e.g., 256). If set, will error if mismatched.")
+    ap.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                    help="Worker processes for batch mode (default: CPU count; 1 disables the pool)")
     args = ap.parse_args()
 
-    inputs = sorted(glob.glob(args.input))
+    inputs = expand_inputs(args.input)
     if not inputs:
         print(f"No inputs matched: {args.input}", file=sys.stderr)
         sys.exit(1)
@@ -68,22 +134,31 @@ def main():
         if args.expect_len and len(data) != args.expect_len:
             print(f"[ERROR] {inputs[0]} produced {len(data)} bytes (expected {args.expect_len})", file=sys.stderr)
             sys.exit(2)
-        with open(out_path, "wb") as f:
-            f.write(data)
+        write_file(out_path, data)
         print(f"[OK] Wrote {len(data)} bytes → {out_path}")
         return
 
-    # Batch mode: write one .bin per input into the output directory
+    # Batch mode: write one .bin per input into the output directory. Files
+    # are independent, so workers parse and write them; only the short
+    # status tuples come back, in input order.
     out_path.mkdir(parents=True, exist_ok=True)
-    for inp in inputs:
-        data = parse_text_spd(Path(inp))
-        if args.expect_len and len(data) != args.expect_len:
-            print(f"[WARN] {inp}: got {len(data)} bytes (expected {args.expect_len}); writing anyway.")
-        base = Path(inp).stem
-        dst = out_path / f"{base}.bin"
-        with open(dst, "wb") as f:
-            f.write(data)
-        print(f"[OK] {inp} → {dst}  ({len(data)} bytes)")
+    out_dir = str(out_path)  # plain-string path joins per file, no Path objects
+    # Inputs sharing a stem (a.txt, a.log) target one .bin; workers would race
+    # on it, so such batches stay serial and the later input wins
+    names = {os.path.normcase(_bin_name(inp)) for inp in inputs}
+    expect_len = args.expect_len
+    msgs = []
+    # The report is written in one go, but also when an input fails part way
+    # so every .bin already written is still listed before the traceback
+    try:
+        if args.jobs > 1 and len(inputs) >= POOL_MIN_INPUTS and len(names) == len(inputs):
+            with ProcessPoolExecutor(max_workers=args.jobs) as ex:
+                _report(ex.map(_try_convert, inputs, repeat(out_dir), chunksize=8), expect_len, msgs)
+        else:
+            _report((_convert(inp, out_dir) for inp in inputs), expect_len, msgs)
+    finally:
+        if msgs:
+            sys.stdout.write("\n".join(msgs) + "\n")
 
 if __name__ == "__main__":
     main()